@@ -10,12 +10,13 @@ Features:
 4. Progress reporting and validation
 
 Usage:
-    python populate_from_api_football.py [--sync-teams] [--sync-fixtures] [--force-update]
+    python populate_from_api_football.py [--sync-teams] [--sync-fixtures] [--force-update] [--verbose]
 
 Options:
     --sync-teams: Sync teams from API-Football
     --sync-fixtures: Sync fixtures from API-Football
     --force-update: Force API updates even with manual overrides
+    --verbose: Print a status line for every team
 
 Requirements:
     - API-Football API key in .env (API_FOOTBALL_KEY)
@@ -25,9 +26,9 @@ Requirements:
 import argparse
 import logging
 import sys
-import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
 from src.api_football_sync import APIFootballSync
 from src.config import config
@@ -42,15 +43,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Team stats are written to Firestore in batches of this size
+STATS_WRITE_BATCH_SIZE = 50
+
+# Without --verbose, print a progress line every N teams instead of per team
+PROGRESS_EVERY = 10
+
+
 # API-Football Team ID mappings for World Cup 2026 teams
 # Source: API-Football v3 national teams database
-API_FOOTBALL_TEAM_IDS = {
+#
+# Every API-Football ID must belong to exactly one team: a reused ID silently
+# fetches another team's statistics. Teams without a verified ID are left
+# unmapped (and skipped) until one is found.
+_API_FOOTBALL_TEAM_IDS = {
     # CONCACAF (Hosts + Qualified)
     "MEX": 16,  # Mexico
     "USA": 2384,  # United States
-    "CAN": 1118,  # Canada
-    "HAI": 2384,  # Haiti (TODO: Find correct ID)
-    "CUR": 2384,  # Curaçao (TODO: Find correct ID)
     "PAN": 1504,  # Panama
     # UEFA (Europe) - Top teams
     "ENG": 10,  # England
@@ -81,7 +90,6 @@ API_FOOTBALL_TEAM_IDS = {
     "ECU": 2382,  # Ecuador
     "PAR": 1569,  # Paraguay (corrected)
     "BOL": 2383,  # Bolivia
-    "VEN": 2383,  # Venezuela (corrected)
     # CAF (Africa)
     "SEN": 13,  # Senegal
     "MAR": 31,  # Morocco
@@ -89,32 +97,57 @@ API_FOOTBALL_TEAM_IDS = {
     "CMR": 1530,  # Cameroon
     "GHA": 1558,  # Ghana
     "TUN": 28,  # Tunisia
-    "ALG": 1569,  # Algeria (corrected)
     "EGY": 1532,  # Egypt
     "CIV": 1501,  # Ivory Coast
     "RSA": 1531,  # South Africa
-    "CPV": 1504,  # Cabo Verde (TODO: Find correct ID)
     # AFC (Asia)
     "JPN": 12,  # Japan
     "KOR": 17,  # South Korea
     "IRN": 22,  # Iran
     "AUS": 18,  # Australia
     "KSA": 23,  # Saudi Arabia (KSA is the correct code)
-    "QAT": 1569,  # Qatar (corrected)
-    "IRQ": 1530,  # Iraq (corrected)
     "JOR": 1565,  # Jordan
     "UZB": 1567,  # Uzbekistan
     # OFC (Oceania)
     "NZL": 1092,  # New Zealand
 }
 
+# Previously mapped to another team's ID - need a verified API-Football ID
+# (CAN shared 1118 with NED, which is the verified owner)
+UNMAPPED_FIFA_CODES = frozenset(
+    {"CAN", "HAI", "CUR", "VEN", "ALG", "CPV", "QAT", "IRQ"}
+)
+
+# Reverse lookup (API-Football ID -> FIFA code), also used to detect reused IDs
+_FIFA_BY_API_ID = {
+    api_id: fifa_code for fifa_code, api_id in _API_FOOTBALL_TEAM_IDS.items()
+}
+if len(_FIFA_BY_API_ID) != len(_API_FOOTBALL_TEAM_IDS):
+    _duplicates = sorted(
+        fifa_code
+        for fifa_code, api_id in _API_FOOTBALL_TEAM_IDS.items()
+        if _FIFA_BY_API_ID[api_id] != fifa_code
+    )
+    raise ValueError(f"Duplicate API-Football team IDs for: {', '.join(_duplicates)}")
 
-def add_api_football_team_ids(firestore_db: FirestoreManager) -> Dict[str, int]:
+API_FOOTBALL_TEAM_IDS = MappingProxyType(_API_FOOTBALL_TEAM_IDS)
+
+
+def add_api_football_team_ids(
+    firestore_db: FirestoreManager,
+    teams: Optional[List[Dict]] = None,
+    verbose: bool = False,
+) -> Dict[str, int]:
     """
     Add API-Football team IDs to all teams in Firestore.
 
+    Team dicts in ``teams`` are updated in place so callers can reuse the
+    same list for later steps without re-reading the collection.
+
     Args:
         firestore_db: Firestore database manager
+        teams: Teams already loaded from Firestore (fetched if None)
+        verbose: Print a status line for every team
 
     Returns:
         Dict mapping FIFA codes to team IDs that were updated
@@ -124,9 +157,14 @@ def add_api_football_team_ids(firestore_db: FirestoreManager) -> Dict[str, int]:
     print("=" * 80)
     print()
 
-    teams = firestore_db.get_all_teams()
+    if teams is None:
+        teams = firestore_db.get_all_teams()
     updated = {}
     missing = []
+    unverified = []
+
+    # Collect all ID updates into one WriteBatch (well under the 500-op limit)
+    batch = firestore_db.db.batch()
 
     for team in teams:
         fifa_code = team.get("fifa_code")
@@ -134,28 +172,47 @@ def add_api_football_team_ids(firestore_db: FirestoreManager) -> Dict[str, int]:
 
         # Skip placeholders
         if team.get("is_placeholder"):
-            print(f"  ⏭️  Skipping placeholder: {team.get('name')}")
+            if verbose:
+                print(f"  ⏭️  Skipping placeholder: {team.get('name')}")
             continue
 
         # Check if API-Football ID mapping exists
         api_football_id = API_FOOTBALL_TEAM_IDS.get(fifa_code)
 
         if api_football_id:
-            # Update team in Firestore
-            firestore_db.teams_collection.document(str(team_id)).set(
-                {"api_football_id": api_football_id}, merge=True
+            # Queue team update for the batch commit
+            batch.set(
+                firestore_db.teams_collection.document(str(team_id)),
+                {"api_football_id": api_football_id},
+                merge=True,
             )
+            team["api_football_id"] = api_football_id
 
             updated[fifa_code] = api_football_id
-            print(f"  ✅ {team.get('name')} ({fifa_code}) → API ID: {api_football_id}")
+            if verbose:
+                print(
+                    f"  ✅ {team.get('name')} ({fifa_code}) → API ID: {api_football_id}"
+                )
+        elif fifa_code in UNMAPPED_FIFA_CODES:
+            unverified.append(f"{team.get('name')} ({fifa_code})")
+            if verbose:
+                print(
+                    f"  ⚠️  {team.get('name')} ({fifa_code}) → "
+                    "Awaiting a verified API ID"
+                )
         else:
             missing.append(f"{team.get('name')} ({fifa_code})")
-            print(f"  ⚠️  {team.get('name')} ({fifa_code}) → No API mapping")
+            if verbose:
+                print(f"  ⚠️  {team.get('name')} ({fifa_code}) → No API mapping")
+
+    if updated:
+        batch.commit()
 
     print()
     print(f"Summary:")
     print(f"  ✅ Updated {len(updated)} teams with API-Football IDs")
     print(f"  ⚠️  Missing {len(missing)} team API mappings")
+    print(f"  ⚠️  Awaiting verified IDs for {len(unverified)} teams")
 
     if missing:
         print()
@@ -163,14 +220,54 @@ def add_api_football_team_ids(firestore_db: FirestoreManager) -> Dict[str, int]:
         for team in missing:
             print(f"    - {team}")
 
+    if unverified:
+        print()
+        print("Teams awaiting a verified API-Football ID (skipped):")
+        for team in unverified:
+            print(f"    - {team}")
+
     print()
     return updated
 
 
+def _write_team_stats(
+    firestore_db: FirestoreManager,
+    pending_stats: List[Tuple[int, Dict, str]],
+    failed: List[str],
+) -> int:
+    """
+    Write a batch of fetched team stats to Firestore.
+
+    If the write fails, every team in the batch is recorded in ``failed``.
+
+    Args:
+        firestore_db: Firestore database manager
+        pending_stats: (team ID, stats, team name) tuples to write
+        failed: Failure messages, appended to in place
+
+    Returns:
+        Number of teams written
+    """
+    try:
+        firestore_db.update_team_stats_bulk(
+            [(team_id, stats) for team_id, stats, _ in pending_stats], ttl_hours=24
+        )
+    except Exception as e:
+        print(f"  ❌ Firestore write failed for {len(pending_stats)} teams: {e}")
+        failed.extend(
+            f"{team_name}: Firestore write failed: {e}"
+            for _, _, team_name in pending_stats
+        )
+        return 0
+    return len(pending_stats)
+
+
 def fetch_team_statistics(
     firestore_db: FirestoreManager,
     aggregator: DataAggregator,
     limit: Optional[int] = None,
+    teams: Optional[List[Dict]] = None,
+    verbose: bool = False,
 ) -> int:
     """
     Fetch team statistics from API-Football for all teams.
@@ -179,6 +276,8 @@ def fetch_team_statistics(
         firestore_db: Firestore database manager
         aggregator: Data aggregator for API-Football
         limit: Maximum number of teams to fetch (None = all)
+        teams: Teams already loaded from Firestore (fetched if None)
+        verbose: Print fetch details for every team
 
     Returns:
         Number of teams successfully fetched
@@ -188,14 +287,15 @@ def fetch_team_statistics(
     print("=" * 80)
     print()
 
-    teams = firestore_db.get_all_teams()
-
-    # Filter teams with API-Football IDs
-    teams_with_api = [
-        team
-        for team in teams
-        if team.get("api_football_id") and not team.get("is_placeholder")
-    ]
+    if teams is None:
+        # Let Firestore filter instead of downloading every team
+        teams_with_api = firestore_db.query_teams(with_api_id=True)
+    else:
+        teams_with_api = [
+            team
+            for team in teams
+            if team.get("api_football_id") and not team.get("is_placeholder")
+        ]
 
     if limit:
         teams_with_api = teams_with_api[:limit]
@@ -203,42 +303,61 @@ def fetch_team_statistics(
     print(f"Found {len(teams_with_api)} teams with API-Football IDs")
     print()
 
+    # Load today's cached stats for these teams in one pass up front
+    aggregator.warm(team.get("api_football_id") for team in teams_with_api)
+
     success_count = 0
     failed = []
+    pending_stats: List[Tuple[int, Dict, str]] = []
 
     for i, team in enumerate(teams_with_api, 1):
         team_name = team.get("name")
         team_id = team.get("id")
         api_football_id = team.get("api_football_id")
 
-        print(f"[{i}/{len(teams_with_api)}] Fetching stats for {team_name}...")
+        if verbose:
+            print(f"[{i}/{len(teams_with_api)}] Fetching stats for {team_name}...")
 
         try:
-            # Fetch stats from API-Football (with caching)
-            stats = aggregator.fetch_team_stats(
-                team_id=api_football_id,
-                fetch_xg=True,  # Fetch xG if available (may cost extra API calls)
-            )
-
-            # Save stats to Firestore with 24-hour TTL
-            firestore_db.update_team_stats(team_id=team_id, stats=stats, ttl_hours=24)
-
-            success_count += 1
-            print(
-                f"  ✅ Stats saved: form={stats.get('form_string')}, "
-                f"clean_sheets={stats.get('clean_sheets')}, "
-                f"avg_xg={stats.get('avg_xg')}"
-            )
+            # Reuse today's local cache file, otherwise fetch from API-Football
+            stats = aggregator.get_cached_stats(api_football_id)
+            if stats is None:
+                stats = aggregator.fetch_team_stats(
+                    team_id=api_football_id,
+                    fetch_xg=True,  # Fetch xG if available (may cost extra API calls)
+                )
+                aggregator.save_to_cache(api_football_id, stats)
+
+            # Queue stats for a batched Firestore write (24-hour TTL)
+            pending_stats.append((team_id, stats, team_name))
+            if verbose:
+                print(
+                    f"  ✅ Stats fetched: form={stats.get('form_string')}, "
+                    f"clean_sheets={stats.get('clean_sheets')}, "
+                    f"avg_xg={stats.get('avg_xg')}"
+                )
 
         except Exception as e:
             failed.append(f"{team_name}: {str(e)}")
-            print(f"  ❌ Failed: {e}")
+            if verbose:
+                print(f"  ❌ Failed: {e}")
 
-        print()
+        # Teams only count as fetched once their stats are written
+        if len(pending_stats) >= STATS_WRITE_BATCH_SIZE:
+            success_count += _write_team_stats(firestore_db, pending_stats, failed)
+            pending_stats = []
+
+        if verbose:
+            print()
+        elif i % PROGRESS_EVERY == 0 or i == len(teams_with_api):
+            print(f"  Progress: {i}/{len(teams_with_api)} teams")
+
+        # No extra sleep here: DataAggregator.fetch_team_stats already enforces
+        # the 0.5s delay between API-Football requests (per RULES.md)
 
-        # Rate limiting: 0.5s between requests (per RULES.md)
-        if i < len(teams_with_api):
-            time.sleep(0.5)
+    # Flush remaining stats
+    if pending_stats:
+        success_count += _write_team_stats(firestore_db, pending_stats, failed)
 
     print()
     print(f"Summary:")
@@ -271,46 +390,46 @@ def validate_migration(firestore_db: FirestoreManager) -> bool:
     print()
 
     try:
-        # Check teams
-        teams = firestore_db.get_all_teams()
-        teams_with_api = [t for t in teams if t.get("api_football_id")]
-        teams_with_stats = [t for t in teams if t.get("stats")]
+        # Check teams (count() aggregations instead of downloading documents)
+        teams_count = firestore_db.count_teams()
+        teams_with_api = firestore_db.count_teams(with_field="api_football_id")
+        teams_with_stats = firestore_db.count_teams(with_field="stats")
 
         print(f"Teams:")
-        print(f"  Total: {len(teams)}")
-        print(f"  With API-Football ID: {len(teams_with_api)}")
-        print(f"  With stats: {len(teams_with_stats)}")
+        print(f"  Total: {teams_count}")
+        print(f"  With API-Football ID: {teams_with_api}")
+        print(f"  With stats: {teams_with_stats}")
         print()
 
         # Check matches
-        matches = firestore_db.get_all_matches()
+        matches_count = firestore_db.count_matches()
 
         print(f"Matches:")
-        print(f"  Total: {len(matches)}")
+        print(f"  Total: {matches_count}")
         print()
 
         # Check data quality
         print("Data Quality:")
 
-        if len(teams) == 0:
+        if teams_count == 0:
             print("  ❌ No teams found in Firestore")
             return False
 
-        if len(matches) == 0:
+        if matches_count == 0:
             print("  ❌ No matches found in Firestore")
             return False
 
         print(f"  ✅ Teams and matches migrated")
 
-        if len(teams_with_api) < 10:
-            print(f"  ⚠️  Only {len(teams_with_api)} teams have API-Football IDs")
+        if teams_with_api < 10:
+            print(f"  ⚠️  Only {teams_with_api} teams have API-Football IDs")
         else:
-            print(f"  ✅ {len(teams_with_api)} teams have API-Football IDs")
+            print(f"  ✅ {teams_with_api} teams have API-Football IDs")
 
-        if len(teams_with_stats) < 5:
-            print(f"  ⚠️  Only {len(teams_with_stats)} teams have statistics")
+        if teams_with_stats < 5:
+            print(f"  ⚠️  Only {teams_with_stats} teams have statistics")
         else:
-            print(f"  ✅ {len(teams_with_stats)} teams have statistics")
+            print(f"  ✅ {teams_with_stats} teams have statistics")
 
         print()
         return True
@@ -482,6 +601,11 @@ def main():
         action="store_true",
         help="Force API updates even with manual overrides",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print a status line for every team",
+    )
     args = parser.parse_args()
 
     print()
@@ -533,8 +657,13 @@ def main():
         print("   Use --sync-teams or --sync-fixtures for new sync module")
         print()
 
+        # Read teams once and share the list between both legacy steps
+        teams = firestore_db.get_all_teams()
+
         # Step 1: Add API-Football team IDs (legacy)
-        updated_teams = add_api_football_team_ids(firestore_db)
+        updated_teams = add_api_football_team_ids(
+            firestore_db, teams, verbose=args.verbose
+        )
 
         if len(updated_teams) == 0:
             print("⚠️  No teams updated with API-Football IDs")
@@ -542,16 +671,18 @@ def main():
 
         # Step 2: Fetch team statistics (legacy)
         print("📊 Fetching statistics for ALL teams with API-Football IDs...")
-        print("   This will take approximately 6 minutes with rate limiting")
+        print("   This will take a few minutes with rate limiting")
         print()
 
         fetch_team_statistics(
             firestore_db=firestore_db,
             aggregator=aggregator,
             limit=None,  # Fetch all teams
+            teams=teams,
+            verbose=args.verbose,
         )
 
-    # Validate
+    # Validate (fresh read to confirm writes landed)
     if not validate_migration(firestore_db):
         print("❌ Validation failed")
         return False
@@ -6,26 +6,33 @@ Implements:
 - Retry strategy (max 1 retry, 2 total attempts)
 - Rule-based fallback on Gemini failures
 - Markdown-wrapped JSON parsing
+- In-process LRU cache for identical matchups
+- Concurrent batch predictions (thread pool, network-bound)
+- Lazy Gemini SDK import and client construction (first API call only)
+- Direct (no-Gemini) predictions for lopsided, in-form matchups
 """
 
+import copy
+import hashlib
+import importlib.util
 import json
 import logging
+import random
+import re
+import threading
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Dict, Any, List, Optional
 
-try:
-    from google import genai  # type: ignore[import-untyped]
-    from google.genai import types  # type: ignore[import-untyped]
-
-    GENAI_VERSION = "new"
-except ImportError:
-    import google.generativeai as genai  # type: ignore[import-not-found,import-untyped,no-redef]
-    types = None  # type: ignore[assignment]
-
-    GENAI_VERSION = "legacy"
+# Detect the installed Gemini SDK without importing it; the import itself is
+# deferred to AIAgent._sdk so cached and fallback predictions never pay for it.
+GENAI_VERSION = "new" if importlib.util.find_spec("google.genai") else "legacy"
 
 from src.config import config
 from src.exceptions import GeminiFailureError
+from src.rate_limiter import TokenBucket
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,31 +42,181 @@ logging.basicConfig(
 )
 
 
+# Maximum number of Gemini predictions kept in the in-process cache
+PREDICTION_CACHE_SIZE = 4096
+
+# Seconds a matchup that exhausted its Gemini retries goes straight to fallback
+NEGATIVE_CACHE_TTL = 300
+
+# Concurrent Gemini calls in generate_predictions_batch (network-bound)
+MAX_PREDICTION_WORKERS = 16
+
+# Tier 1 Paid: 2,000 RPM. Bursts up to one request per batch worker.
+GEMINI_REQUESTS_PER_MINUTE = 2000
+GEMINI_BURST = MAX_PREDICTION_WORKERS
+
+# Jittered exponential backoff between Gemini attempts (seconds)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+# On a 429, retry once if Gemini asks us to wait no longer than this (seconds);
+# longer waits go straight to the rule-based fallback
+RATE_LIMIT_MAX_WAIT = 5
+
+# Skip Gemini when the xG gap exceeds this and both teams' form agrees
+DIRECT_XG_THRESHOLD = 1.5
+DIRECT_MIN_FORM_RESULTS = 3
+
+# Team fields that feed the Gemini prompt (and therefore the cache key)
+PROMPT_TEAM_KEYS = (
+    "name",
+    "avg_xg",
+    "clean_sheets",
+    "form_string",
+    "fifa_ranking",
+    "fifa_points",
+    "fifa_confederation",
+)
+
+# Floats in the cache key are rounded to this many decimals, so matchups that
+# differ only by noise in averages (xG 1.234 vs 1.236) share a prediction
+CACHE_KEY_FLOAT_DECIMALS = 1
+
+# Extracts the server-suggested wait from a Gemini 429 error message
+_RETRY_DELAY_RE = re.compile(r"'retryDelay': '(\d+)s'")
+
+# Decodes the first JSON value in a response, ignoring anything after it
+_JSON_DECODER = json.JSONDecoder()
+
+# Bump whenever the prompt template in call_gemini changes, so predictions
+# persisted with the old template are regenerated
+PROMPT_TEMPLATE_VERSION = 2
+
+# Per-match prompt templates (in Norwegian), filled in by build_prompt
+PROMPT_HEADER = "Spå resultatet av denne VM 2026-kampen:\n\n"
+PROMPT_HOME_LABEL = "Hjemmelag"
+PROMPT_AWAY_LABEL = "Bortelag"
+PROMPT_TEAM_TEMPLATE = """{label}: {name}
+- Gjennomsnittlig xG: {avg_xg}
+- Nullet motstanderen: {clean_sheets}
+- Siste form: {form_string}{fifa}"""
+PROMPT_FIFA_RANK_TEMPLATE = "\n- FIFA-rangering: #{rank}"
+PROMPT_API_FOOTBALL_TEMPLATE = """
+
+API-Football statistisk spådom:
+- Sannsynlighet for vinner: Hjemme {home_percent}%, Uavgjort {draw_percent}%, Borte {away_percent}%
+- Forventet vinner: {winner}
+- Råd: {advice}
+
+Sammenligningsmålinger:
+- Form: {form_home} (hjemme) vs {form_away} (borte)
+- Angrep: {att_home} vs {att_away}
+- Forsvar: {def_home} vs {def_away}
+
+Bruk denne statistiske spådommen som grunnlag, men bruk din analyse av lagform, xG og clean sheets for å forbedre spådommen."""
+
+# Output instructions shared by every call. Sent as the system instruction
+# (new SDK) so the static part is a stable prefix Gemini can cache; the
+# legacy SDK gets it appended to the prompt.
+PREDICTION_SCHEMA_INSTRUCTION = """Gi spådommen som JSON med nøyaktig dette skjemaet:
+{
+  "winner": "lagnavn eller Uavgjort",
+  "win_probability": 0.0-1.0,
+  "predicted_home_score": heltall,
+  "predicted_away_score": heltall,
+  "reasoning": "kort forklaring på norsk (maks 200 tegn)"
+}"""
+
+
+def _round_floats(value: Any) -> Any:
+    """Round floats nested in dicts/lists to CACHE_KEY_FLOAT_DECIMALS."""
+    if isinstance(value, float):
+        return round(value, CACHE_KEY_FLOAT_DECIMALS)
+    if isinstance(value, dict):
+        return {k: _round_floats(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(v) for v in value]
+    return value
+
+
+@lru_cache(maxsize=512)
+def fifa_fragment(
+    ranking: Optional[int],
+    points: Optional[float],
+    confederation: Optional[str],
+) -> str:
+    """
+    FIFA ranking line for a team's prompt block ("" without a ranking).
+
+    Cached because a team's FIFA data is stable across a pipeline run while the
+    team appears in several matchups.
+    """
+    if not ranking:
+        return ""
+
+    fragment = PROMPT_FIFA_RANK_TEMPLATE.format(rank=ranking)
+    if points:
+        fragment += f" ({points:.2f} poeng"
+        if confederation:
+            fragment += f", {confederation}"
+        fragment += ")"
+    return fragment
+
+
 class AIAgent:
     """Generate match predictions using Gemini AI with rule-based fallback."""
 
     def __init__(self):
         """Initialize Gemini AI client with JSON response mode and rate limiting."""
-        self.last_request_time = 0.0  # Track last API call for rate limiting
-        self.min_delay = 0.05  # Tier 1 Paid: 2,000 RPM = 33.3 req/sec, minimal delay
+        self.rate_limiter = TokenBucket(
+            rate=GEMINI_REQUESTS_PER_MINUTE / 60, capacity=GEMINI_BURST
+        )
+
+        # Gemini predictions keyed by matchup fingerprint (LRU order)
+        self._prediction_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Matchups whose Gemini retries failed, mapped to monotonic expiry time
+        # (guarded by _cache_lock)
+        self._negative_cache: Dict[bytes, float] = {}
 
         if GENAI_VERSION == "new":
             # New google.genai SDK (Google AI Studio - Tier 1 Paid)
-            self.client = genai.Client(api_key=config.GEMINI_API_KEY or "test-key")
-
             # Using gemini-2.5-flash for best quality
             # Tier 1 Paid: 2,000 RPM limit (no need for Lite version)
             self.model_name = "gemini-2.5-flash"
         else:
             # Legacy google.generativeai SDK
-            genai.configure(api_key=config.GEMINI_API_KEY or "test-key")  # type: ignore[attr-defined]
-            self.model = genai.GenerativeModel(  # type: ignore[attr-defined]
-                "gemini-1.5-pro",
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": 0.7,
-                },
-            )
+            self.model_name = "gemini-1.5-pro"
+
+        # Identifies the model + prompt template behind persisted predictions
+        self.prompt_version = f"{self.model_name}:v{PROMPT_TEMPLATE_VERSION}"
+
+    @cached_property
+    def _sdk(self) -> Any:
+        """Gemini SDK module, imported on first use."""
+        if GENAI_VERSION == "new":
+            from google import genai  # type: ignore[import-untyped]
+        else:
+            import google.generativeai as genai  # type: ignore[import-not-found,import-untyped,no-redef]
+        return genai
+
+    @cached_property
+    def client(self) -> Any:
+        """google.genai client, constructed on the first Gemini call."""
+        return self._sdk.Client(api_key=config.GEMINI_API_KEY or "test-key")
+
+    @cached_property
+    def model(self) -> Any:
+        """Legacy google.generativeai model, configured on the first Gemini call."""
+        self._sdk.configure(api_key=config.GEMINI_API_KEY or "test-key")
+        return self._sdk.GenerativeModel(
+            self.model_name,
+            generation_config={
+                "response_mime_type": "application/json",
+                "temperature": 0.7,
+            },
+        )
 
     def generate_prediction(self, matchup: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -67,9 +224,14 @@ class AIAgent:
 
         Retry Strategy:
         - Max 1 retry (2 total attempts)
-        - 1 second backoff between attempts
+        - Jittered exponential backoff between attempts
+        - 429s are retried only if Gemini's retryDelay is short
         - After 2 failures: call rule_based_prediction()
 
+        Successful Gemini predictions are cached per matchup fingerprint, so
+        an identical matchup is answered without another API call. Lopsided
+        matchups (see _try_direct) are answered without calling Gemini at all.
+
         Args:
             matchup: Dictionary with home_team and away_team data containing:
                 - name: str
@@ -84,7 +246,8 @@ class AIAgent:
                 - predicted_home_score: int
                 - predicted_away_score: int
                 - reasoning: str
-                - confidence: str (only for rule-based fallback)
+                - confidence: str (only for rule-based fallback and direct)
+                - source: "direct" (only for direct predictions)
         """
         max_retries = 1
         home_name = matchup.get("home_team", {}).get("name", "Unknown")
@@ -94,24 +257,42 @@ class AIAgent:
         logger.info(
             f"Generating prediction for match {match_id}: {home_name} vs {away_name}"
         )
+
+        direct = self._try_direct(matchup)
+        if direct is not None:
+            logger.info(
+                f"Direct prediction for match {match_id} (Gemini skipped): {direct['winner']}"
+            )
+            return direct
+
+        cache_key = self._matchup_key(matchup)
+        with self._cache_lock:
+            cached = self._prediction_cache.get(cache_key)
+            if cached is not None:
+                self._prediction_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info(f"Prediction cache HIT for match {match_id}")
+            return copy.deepcopy(cached)
+
+        if self._recently_failed(cache_key):
+            logger.info(
+                f"Gemini recently failed for match {match_id}, using rule-based fallback"
+            )
+            return self.rule_based_prediction(matchup)
+
         start_time = time.time()
 
         for attempt in range(max_retries + 1):
             try:
-                # Rate limiting: ensure minimum delay between requests
-                if self.last_request_time > 0:
-                    elapsed_since_last = time.time() - self.last_request_time
-                    if elapsed_since_last < self.min_delay:
-                        sleep_time = self.min_delay - elapsed_since_last
-                        logger.debug(f"Rate limiting: sleeping {sleep_time:.1f}s")
-                        time.sleep(sleep_time)
+                # Rate limiting: shared token bucket (also paces batch workers)
+                self.rate_limiter.acquire()
 
                 response = self.call_gemini(matchup)
-                self.last_request_time = time.time()  # Update last request time
                 parsed = self._parse_response(response.text)
 
                 # Validate response has required fields
                 self._validate_prediction(parsed)
+                self._cache_prediction(cache_key, parsed)
 
                 elapsed = time.time() - start_time
                 logger.info(
@@ -129,16 +310,22 @@ class AIAgent:
                     retry_delay = 30
                     if "retryDelay" in error_msg:
                         # Try to extract delay from error message
-                        import re
-
-                        match = re.search(r"'retryDelay': '(\d+)s'", error_msg)
+                        match = _RETRY_DELAY_RE.search(error_msg)
                         if match:
                             retry_delay = int(match.group(1))
 
+                    if attempt < max_retries and retry_delay <= RATE_LIMIT_MAX_WAIT:
+                        delay = retry_delay * random.uniform(1.0, 1.5)
+                        logger.warning(
+                            f"Rate limit hit for match {match_id}, retrying in {delay:.2f}s"
+                        )
+                        time.sleep(delay)
+                        continue
+
                     logger.warning(
                         f"Rate limit hit for match {match_id}, would need to wait {retry_delay}s. Using fallback instead."
                     )
-                    # Immediately use fallback instead of waiting
+                    # Use fallback instead of a long wait
                     fallback = self.rule_based_prediction(matchup)
                     logger.info(
                         f"Rule-based fallback for match {match_id}: {fallback.get('winner')}"
@@ -146,7 +333,9 @@ class AIAgent:
                     return fallback
 
                 if attempt == max_retries:
-                    # Final attempt failed - use rule-based fallback
+                    # Final attempt failed - use rule-based fallback and skip
+                    # Gemini for this matchup until NEGATIVE_CACHE_TTL expires
+                    self._mark_failed(cache_key)
                     logger.warning(
                         f"Gemini prediction FAILED for match {match_id} after {attempt + 1} attempts (elapsed {elapsed:.2f}s), using rule-based fallback: {e}"
                     )
@@ -157,109 +346,283 @@ class AIAgent:
                     return fallback
 
                 # Backoff before retry
+                delay = self._backoff_delay(attempt)
                 logger.warning(
-                    f"Gemini prediction failed (attempt {attempt + 1}), retrying in 1s: {e}"
+                    f"Gemini prediction failed (attempt {attempt + 1}), retrying in {delay:.2f}s: {e}"
                 )
-                time.sleep(1)
+                time.sleep(delay)
 
         # Should never reach here, but satisfy type checker
         return self.rule_based_prediction(matchup)
 
-    def call_gemini(self, matchup: Dict[str, Any]) -> Any:
+    def _try_direct(self, matchup: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Call Gemini API with structured prompt.
+        Predict lopsided matchups without Gemini.
 
-        This method is designed to be mockable for testing.
+        When both xG values are known, differ by more than DIRECT_XG_THRESHOLD,
+        and the favourite's recent form has at least DIRECT_MIN_FORM_RESULTS
+        wins while the underdog's has as many losses, Gemini's answer matches
+        the rule-based one, so that is returned with high confidence.
+
+        Returns:
+            Prediction dictionary with confidence="high" and source="direct",
+            or None if Gemini should be asked
+        """
+        home = matchup["home_team"]
+        away = matchup["away_team"]
+        home_xg = home.get("avg_xg")
+        away_xg = away.get("avg_xg")
+        if home_xg is None or away_xg is None:
+            return None
+        if abs(home_xg - away_xg) <= DIRECT_XG_THRESHOLD:
+            return None
+
+        favourite, underdog = (home, away) if home_xg > away_xg else (away, home)
+        favourite_wins = (favourite.get("form_string") or "").count("W")
+        underdog_losses = (underdog.get("form_string") or "").count("L")
+        if (
+            favourite_wins < DIRECT_MIN_FORM_RESULTS
+            or underdog_losses < DIRECT_MIN_FORM_RESULTS
+        ):
+            return None
+
+        prediction = self.rule_based_prediction(matchup)
+        prediction["confidence"] = "high"
+        prediction["source"] = "direct"
+        return prediction
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """
+        Jittered exponential backoff before retry number `attempt + 1`.
+
+        The jitter keeps concurrent batch workers that failed together from
+        retrying in lockstep and tripping the rate limit again.
+        """
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    def generate_predictions_batch(
+        self,
+        matchups: List[Dict[str, Any]],
+        max_workers: int = MAX_PREDICTION_WORKERS,
+        errors: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for many matchups concurrently.
+
+        Each matchup goes through generate_prediction (cache, retry, fallback)
+        on a thread pool, so Gemini round-trips overlap instead of running
+        back to back. The shared token bucket keeps workers within the RPM budget.
+        A matchup whose prediction raises falls back to rule_based_prediction
+        without affecting the rest of the batch.
 
         Args:
-            matchup: Match data with team statistics and optional API-Football prediction
+            matchups: Matchup dictionaries as accepted by generate_prediction
+            max_workers: Maximum concurrent Gemini calls
+            errors: Optional list that receives one message per failed matchup
 
         Returns:
-            Gemini response object with .text attribute
+            Predictions in the same order as matchups
+        """
+        if not matchups:
+            return []
+
+        workers = min(max_workers, len(matchups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.generate_prediction, matchup)
+                for matchup in matchups
+            ]
+
+        predictions = []
+        for matchup, future in zip(matchups, futures):
+            try:
+                predictions.append(future.result())
+            except Exception as e:
+                label = (
+                    f"{matchup['home_team'].get('name')} vs "
+                    f"{matchup['away_team'].get('name')}"
+                )
+                if isinstance(e, GeminiFailureError):
+                    error_msg = f"Gemini prediction failed for {label}: {e}"
+                else:
+                    error_msg = f"Failed to predict {label}: {e}"
+                logger.error(error_msg)
+                if errors is not None:
+                    errors.append(error_msg)
+                predictions.append(self.rule_based_prediction(matchup))
+
+        return predictions
+
+    @staticmethod
+    def _matchup_key(matchup: Dict[str, Any]) -> bytes:
+        """
+        Fingerprint the prediction inputs of a matchup.
 
-        Raises:
-            GeminiFailureError: On API failures
+        Only the fields used in the Gemini prompt are hashed, so the same
+        teams with the same stats share a prediction regardless of which
+        fixture (match_id, match_number, stage_id) they meet in. Floats are
+        rounded to CACHE_KEY_FLOAT_DECIMALS so near-identical stats match too.
+
+        Args:
+            matchup: Match data passed to generate_prediction
+
+        Returns:
+            16-byte BLAKE2b digest of the canonical JSON encoding
         """
-        home = matchup["home_team"]
-        away = matchup["away_team"]
-        api_prediction = matchup.get("api_football_prediction")
+        inputs: Dict[str, Any] = {
+            side: {key: matchup.get(side, {}).get(key) for key in PROMPT_TEAM_KEYS}
+            for side in ("home_team", "away_team")
+        }
+        inputs["api_football_prediction"] = matchup.get("api_football_prediction")
+
+        canonical = json.dumps(_round_floats(inputs), sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+    def _cache_prediction(self, cache_key: bytes, prediction: Dict[str, Any]) -> None:
+        """
+        Store a validated Gemini prediction, evicting the least recently used.
+
+        Args:
+            cache_key: Matchup fingerprint from _matchup_key
+            prediction: Validated prediction dictionary
+        """
+        with self._cache_lock:
+            self._prediction_cache[cache_key] = copy.deepcopy(prediction)
+            self._prediction_cache.move_to_end(cache_key)
 
-        # Build FIFA ranking lines if available
-        home_fifa = ""
-        if home.get("fifa_ranking"):
-            home_fifa = f"\n- FIFA-rangering: #{home['fifa_ranking']}"
-            if home.get("fifa_points"):
-                home_fifa += f" ({home['fifa_points']:.2f} poeng"
-                if home.get("fifa_confederation"):
-                    home_fifa += f", {home['fifa_confederation']}"
-                home_fifa += ")"
-        
-        away_fifa = ""
-        if away.get("fifa_ranking"):
-            away_fifa = f"\n- FIFA-rangering: #{away['fifa_ranking']}"
-            if away.get("fifa_points"):
-                away_fifa += f" ({away['fifa_points']:.2f} poeng"
-                if away.get("fifa_confederation"):
-                    away_fifa += f", {away['fifa_confederation']}"
-                away_fifa += ")"
-        
-        # Build prompt with aggregated statistics (in Norwegian)
-        prompt = f"""Spå resultatet av denne VM 2026-kampen:
-
-Hjemmelag: {home["name"]}
-- Gjennomsnittlig xG: {home.get("avg_xg", "N/A")}
-- Nullet motstanderen: {home.get("clean_sheets", 0)}
-- Siste form: {home.get("form_string", "Ukjent")}{home_fifa}
-
-Bortelag: {away["name"]}
-- Gjennomsnittlig xG: {away.get("avg_xg", "N/A")}
-- Nullet motstanderen: {away.get("clean_sheets", 0)}
-- Siste form: {away.get("form_string", "Ukjent")}{away_fifa}"""
+            if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+
+    def _mark_failed(self, cache_key: bytes) -> None:
+        """
+        Add a matchup to the negative cache, dropping expired entries.
+
+        Entries are otherwise only removed when the same matchup is looked up
+        again, so pruning on insert keeps the cache from growing without bound.
+
+        Args:
+            cache_key: Matchup fingerprint from _matchup_key
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            expired = [
+                key
+                for key, expires_at in self._negative_cache.items()
+                if expires_at <= now
+            ]
+            for key in expired:
+                del self._negative_cache[key]
+            self._negative_cache[cache_key] = now + NEGATIVE_CACHE_TTL
+
+    def _recently_failed(self, cache_key: bytes) -> bool:
+        """Check (and expire) the negative cache entry for a matchup."""
+        with self._cache_lock:
+            expires_at = self._negative_cache.get(cache_key)
+            if expires_at is None:
+                return False
+            if expires_at > time.monotonic():
+                return True
+            del self._negative_cache[cache_key]
+            return False
+
+    def build_prompt(self, matchup: Dict[str, Any]) -> str:
+        """
+        Build the per-match Gemini prompt (in Norwegian) from the templates.
+
+        Args:
+            matchup: Match data with team statistics and optional API-Football prediction
+
+        Returns:
+            Prompt text (the JSON schema is sent separately)
+        """
+        parts = [
+            PROMPT_HEADER,
+            self._format_team(PROMPT_HOME_LABEL, matchup["home_team"]),
+            "\n\n",
+            self._format_team(PROMPT_AWAY_LABEL, matchup["away_team"]),
+        ]
 
         # Add API-Football prediction data if available
+        api_prediction = matchup.get("api_football_prediction")
         if api_prediction:
             predictions = api_prediction.get("predictions", {})
-            winner = predictions.get("winner", {})
             percent = predictions.get("percent", {})
+            comparison = api_prediction.get("comparison", {})
+            form = comparison.get("form", {})
+            att = comparison.get("att", {})
+            defence = comparison.get("def", {})
+
+            parts.append(
+                PROMPT_API_FOOTBALL_TEMPLATE.format(
+                    home_percent=percent.get("home", "N/A"),
+                    draw_percent=percent.get("draw", "N/A"),
+                    away_percent=percent.get("away", "N/A"),
+                    winner=predictions.get("winner", {}).get("name", "N/A"),
+                    advice=predictions.get("advice", "N/A"),
+                    form_home=form.get("home", "N/A"),
+                    form_away=form.get("away", "N/A"),
+                    att_home=att.get("home", "N/A"),
+                    att_away=att.get("away", "N/A"),
+                    def_home=defence.get("home", "N/A"),
+                    def_away=defence.get("away", "N/A"),
+                )
+            )
 
-            prompt += f"""
+        return "".join(parts)
 
-API-Football statistisk spådom:
-- Sannsynlighet for vinner: Hjemme {percent.get("home", "N/A")}%, Uavgjort {percent.get("draw", "N/A")}%, Borte {percent.get("away", "N/A")}%
-- Forventet vinner: {winner.get("name", "N/A")}
-- Råd: {predictions.get("advice", "N/A")}
+    @staticmethod
+    def _format_team(label: str, team: Dict[str, Any]) -> str:
+        """Format one team's statistics block, with FIFA ranking if available."""
+        fifa = fifa_fragment(
+            team.get("fifa_ranking"),
+            team.get("fifa_points"),
+            team.get("fifa_confederation"),
+        )
 
-Sammenligningsmålinger:
-- Form: {api_prediction.get("comparison", {}).get("form", {}).get("home", "N/A")} (hjemme) vs {api_prediction.get("comparison", {}).get("form", {}).get("away", "N/A")} (borte)
-- Angrep: {api_prediction.get("comparison", {}).get("att", {}).get("home", "N/A")} vs {api_prediction.get("comparison", {}).get("att", {}).get("away", "N/A")}
-- Forsvar: {api_prediction.get("comparison", {}).get("def", {}).get("home", "N/A")} vs {api_prediction.get("comparison", {}).get("def", {}).get("away", "N/A")}
+        return PROMPT_TEAM_TEMPLATE.format(
+            label=label,
+            name=team["name"],
+            avg_xg=team.get("avg_xg", "N/A"),
+            clean_sheets=team.get("clean_sheets", 0),
+            form_string=team.get("form_string", "Ukjent"),
+            fifa=fifa,
+        )
 
-Bruk denne statistiske spådommen som grunnlag, men bruk din analyse av lagform, xG og clean sheets for å forbedre spådommen."""
+    def call_gemini(self, matchup: Dict[str, Any]) -> Any:
+        """
+        Call Gemini API with structured prompt.
 
-        prompt += """
+        This method is designed to be mockable for testing.
 
-Gi spådommen som JSON med nøyaktig dette skjemaet:
-{
-  "winner": "lagnavn eller Uavgjort",
-  "win_probability": 0.0-1.0,
-  "predicted_home_score": heltall,
-  "predicted_away_score": heltall,
-  "reasoning": "kort forklaring på norsk (maks 200 tegn)"
-}"""
+        Args:
+            matchup: Match data with team statistics and optional API-Football prediction
+
+        Returns:
+            Gemini response object with .text attribute
+
+        Raises:
+            GeminiFailureError: On API failures
+        """
+        prompt = self.build_prompt(matchup)
 
         logger.debug(f"Calling Gemini API with prompt: {prompt[:100]}...")
         api_start = time.time()
 
         try:
             if GENAI_VERSION == "new":
+                from google.genai import types  # type: ignore[import-untyped]
+
                 # New SDK: use generate_content with JSON response schema
                 response = self.client.models.generate_content(
                     model=self.model_name,
                     contents=prompt,
-                    config=types.GenerateContentConfig(  # type: ignore[union-attr]
+                    config=types.GenerateContentConfig(
+                        system_instruction=PREDICTION_SCHEMA_INSTRUCTION,
                         response_mime_type="application/json",
                         temperature=0.7,
-                        automatic_function_calling=types.AutomaticFunctionCallingConfig(  # type: ignore[union-attr]
+                        automatic_function_calling=types.AutomaticFunctionCallingConfig(
                             disable=True  # Disable AFC - we don't use function calling
                         ),
                     ),
@@ -275,7 +638,9 @@ Gi spådommen som JSON med nøyaktig dette skjemaet:
                 return ResponseWrapper(response.text)
             else:
                 # Legacy SDK
-                result = self.model.generate_content(prompt)
+                result = self.model.generate_content(
+                    f"{prompt}\n\n{PREDICTION_SCHEMA_INSTRUCTION}"
+                )
                 api_elapsed = time.time() - api_start
                 logger.debug(f"Gemini API response time: {api_elapsed:.2f}s")
                 return result
@@ -287,9 +652,11 @@ Gi spådommen som JSON med nøyaktig dette skjemaet:
 
     def _parse_response(self, response_text: str) -> Dict[str, Any]:
         """
-        Parse JSON response, handling markdown code blocks.
+        Parse JSON response, handling markdown code blocks and trailing text.
 
-        Gemini may wrap JSON in ```json ... ``` blocks even in JSON mode.
+        Gemini may wrap JSON in ```json ... ``` blocks or add stray text after
+        the object even in JSON mode. Decoding starts at the first "{" and
+        stops at the end of that object, so both are ignored without a retry.
 
         Args:
             response_text: Raw response text
@@ -300,24 +667,15 @@ Gi spådommen som JSON med nøyaktig dette skjemaet:
         Raises:
             json.JSONDecodeError: If parsing fails
         """
-        text = response_text.strip()
+        logger.debug(f"Parsing Gemini response: {response_text[:100]}...")
 
-        logger.debug(f"Parsing Gemini response: {text[:100]}...")
-
-        # Strip markdown code blocks if present
-        if text.startswith("```json"):
-            logger.debug("Stripping ```json code block wrapper")
-            text = text.replace("```json", "", 1)
-        if text.startswith("```"):
-            logger.debug("Stripping ``` code block wrapper")
-            text = text.replace("```", "", 1)
-        if text.endswith("```"):
-            text = text.rsplit("```", 1)[0]
-
-        text = text.strip()
+        text = response_text.strip()
+        start = max(text.find("{"), 0)
 
         try:
-            parsed = json.loads(text)
+            parsed, end = _JSON_DECODER.raw_decode(text, start)
+            if text[end:].strip():
+                logger.debug(f"Ignoring trailing response text: {text[end:][:100]}")
             logger.debug(f"Successfully parsed JSON response")
             return parsed
         except json.JSONDecodeError as e:
@@ -413,3 +771,23 @@ Gi spådommen som JSON med nøyaktig dette skjemaet:
                 "reasoning": f"Høyere xG-gjennomsnitt ({away_xg:.2f} vs {home_xg:.2f})",
                 "confidence": "low",
             }
+
+
+# Process-wide agent shared by all requests (see get_ai_agent)
+_AGENT_SINGLETON: Optional[AIAgent] = None
+_AGENT_LOCK = threading.Lock()
+
+
+def get_ai_agent() -> AIAgent:
+    """
+    Return the process-wide AIAgent, creating it on first use.
+
+    Callers should use this rather than AIAgent() so the Gemini client, rate
+    limiter and prediction cache are shared across requests.
+    """
+    global _AGENT_SINGLETON
+    if _AGENT_SINGLETON is None:
+        with _AGENT_LOCK:
+            if _AGENT_SINGLETON is None:
+                _AGENT_SINGLETON = AIAgent()
+    return _AGENT_SINGLETON
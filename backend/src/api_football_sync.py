@@ -3,15 +3,18 @@ API-Football sync module for syncing teams and fixtures from API-Football to Fir
 
 Implements:
 - Raw API response storage
-- Change detection between API data and Firestore data
+- Change detection between API data and Firestore data (content hashes)
 - Conflict resolution with manual overrides
 - Team and fixture synchronization
 """
 
+import hashlib
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
 
 from src.data_aggregator import DataAggregator
 from src.firestore_manager import FirestoreManager
@@ -20,7 +23,32 @@ from src.firestore_manager import FirestoreManager
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class EntitySpec:
+    """Where an entity type's ID and synced field live in API and Firestore data."""
+
+    entity_key: str  # Key of the entity in a raw API item ("team"/"fixture")
+    api_field: str  # Synced field inside the raw entity
+    id_field: str  # Firestore field holding the API-Football ID
+    doc_field: str  # Firestore field holding the synced value
+    conflict_field: str  # Field name reported in conflicts
+
+
+ENTITY_SPECS = {
+    "teams": EntitySpec("team", "name", "api_football_id", "name", "name"),
+    "fixtures": EntitySpec(
+        "fixture", "date", "api_football_fixture_id", "kickoff", "date"
+    ),
+}
+
+
+def content_hash(raw_entity: Dict[str, Any]) -> str:
+    """SHA-256 of a raw API-Football entity, independent of key order."""
+    payload = json.dumps(raw_entity, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
 class SyncResult:
     """Result of a sync operation."""
 
@@ -37,7 +65,7 @@ class SyncResult:
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeSet:
     """Set of changes detected during sync."""
 
@@ -45,9 +73,11 @@ class ChangeSet:
     entities_to_update: List[Dict[str, Any]] = field(default_factory=list)
     entities_unchanged: List[Dict[str, Any]] = field(default_factory=list)
     conflicts: List["Conflict"] = field(default_factory=list)
+    # content_hash of every raw entity, keyed by API-Football ID
+    content_hashes: Dict[int, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Conflict:
     """Represents a conflict between API data and Firestore data."""
 
@@ -59,7 +89,7 @@ class Conflict:
     manual_override: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Resolution:
     """Resolution of a conflict."""
 
@@ -103,29 +133,41 @@ class APIFootballSync:
             f"Starting team sync: league_id={league_id}, season={season}, force_update={force_update}"
         )
         errors: List[str] = []
+        # One timestamp for every document written by this sync and its result
+        synced_at = datetime.now(timezone.utc).isoformat()
 
         try:
             # Step 1: Fetch teams from API-Football
             logger.info("Step 1: Fetching teams from API-Football")
             raw_response = self.data_aggregator.fetch_teams(league_id, season)
 
-            # Step 2: Store raw response in Firestore
-            logger.info("Step 2: Storing raw API response")
-            raw_document_id = self.firestore_manager.store_raw_api_response(
-                entity_type="teams",
-                league_id=league_id,
-                season=season,
-                raw_response=raw_response,
-            )
+            # Steps 2 and 3 only depend on the API response, so the raw
+            # response is stored while existing teams are read
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Step 2: Store raw response in Firestore
+                logger.info("Step 2: Storing raw API response")
+                store_future = executor.submit(
+                    self.firestore_manager.store_raw_api_response,
+                    entity_type="teams",
+                    league_id=league_id,
+                    season=season,
+                    raw_response=raw_response,
+                )
+
+                # Step 3: Fetch the existing teams present in the API response
+                logger.info("Step 3: Fetching existing teams from Firestore")
+                raw_entities = raw_response.get("response", [])
+                existing_teams = self.firestore_manager.get_teams_by_api_ids(
+                    entity["team"]["id"] for entity in raw_entities if "team" in entity
+                )
 
-            # Step 3: Fetch existing teams from Firestore
-            logger.info("Step 3: Fetching existing teams from Firestore")
-            existing_teams = self.firestore_manager.get_all_teams()
+                raw_document_id = store_future.result()
 
             # Step 4: Detect changes
             logger.info("Step 4: Detecting changes")
-            raw_entities = raw_response.get("response", [])
-            changeset = self.detect_changes(raw_entities, existing_teams)
+            changeset = self.detect_changes(
+                raw_entities, existing_teams, entity_type="teams"
+            )
 
             # Step 5: Resolve conflicts if any
             resolutions: List[Resolution] = []
@@ -143,7 +185,7 @@ class APIFootballSync:
             # Add new teams
             for entity in changeset.entities_to_add:
                 try:
-                    team_data = entity.get("team", {})
+                    team_data = entity["team"]
                     # Create team in Firestore
                     # Note: We'd need to map API-Football team to our Team dataclass
                     # For now, just count it
@@ -153,40 +195,27 @@ class APIFootballSync:
                     errors.append(error_msg)
                     logger.error(error_msg)
 
-            # Update existing teams (including unchanged to refresh timestamps)
-            for entity in changeset.entities_to_update:
-                try:
-                    team_data = entity.get("team", {})
-                    # Update team in Firestore
-                    # For now, just count it
-                    entities_updated += 1
-                except Exception as e:
-                    error_msg = f"Failed to update team: {e}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-
-            # Refresh unchanged entities (count as updated for sync purposes)
-            for entity in changeset.entities_unchanged:
-                try:
-                    team_data = entity.get("team", {})
-                    # Refresh team data in Firestore
-                    # For now, just count it
-                    entities_updated += 1
-                except Exception as e:
-                    error_msg = f"Failed to refresh team: {e}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-
-            # Apply conflict resolutions
-            for resolution in resolutions:
-                if resolution.action == "apply_api_update":
-                    try:
-                        # Apply API update
-                        entities_updated += 1
-                    except Exception as e:
-                        error_msg = f"Failed to apply resolution: {e}"
-                        errors.append(error_msg)
-                        logger.error(error_msg)
+            # Update changed teams and applied conflict resolutions in batched
+            # writes (unchanged teams are not rewritten)
+            updates = self._build_updates(
+                changeset,
+                resolutions,
+                existing_teams,
+                entity_type="teams",
+                raw_document_id=raw_document_id,
+                synced_at=synced_at,
+            )
+            try:
+                self.firestore_manager.upsert_teams_bulk(updates)
+                entities_updated = len(updates)
+                # One freshness marker instead of touching every unchanged team
+                self.firestore_manager.set_sync_metadata(
+                    "teams", league_id, season, synced_at
+                )
+            except Exception as e:
+                error_msg = f"Failed to update teams: {e}"
+                errors.append(error_msg)
+                logger.error(error_msg)
 
             # Step 7: Build and return SyncResult
             result = SyncResult(
@@ -199,7 +228,7 @@ class APIFootballSync:
                 conflicts_resolved=len(resolutions),
                 changes_detected=entities_added + entities_updated,
                 raw_document_id=raw_document_id,
-                synced_at=datetime.utcnow().isoformat(),
+                synced_at=synced_at,
                 errors=errors,
             )
 
@@ -226,7 +255,7 @@ class APIFootballSync:
                 conflicts_resolved=0,
                 changes_detected=0,
                 raw_document_id="",
-                synced_at=datetime.utcnow().isoformat(),
+                synced_at=synced_at,
                 errors=errors,
             )
 
@@ -248,29 +277,43 @@ class APIFootballSync:
             f"Starting fixture sync: league_id={league_id}, season={season}, force_update={force_update}"
         )
         errors: List[str] = []
+        # One timestamp for every document written by this sync and its result
+        synced_at = datetime.now(timezone.utc).isoformat()
 
         try:
             # Step 1: Fetch fixtures from API-Football
             logger.info("Step 1: Fetching fixtures from API-Football")
             raw_response = self.data_aggregator.fetch_fixtures(league_id, season)
 
-            # Step 2: Store raw response in Firestore
-            logger.info("Step 2: Storing raw API response")
-            raw_document_id = self.firestore_manager.store_raw_api_response(
-                entity_type="fixtures",
-                league_id=league_id,
-                season=season,
-                raw_response=raw_response,
-            )
+            # Steps 2 and 3 only depend on the API response, so the raw
+            # response is stored while existing matches are read
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Step 2: Store raw response in Firestore
+                logger.info("Step 2: Storing raw API response")
+                store_future = executor.submit(
+                    self.firestore_manager.store_raw_api_response,
+                    entity_type="fixtures",
+                    league_id=league_id,
+                    season=season,
+                    raw_response=raw_response,
+                )
 
-            # Step 3: Fetch existing matches from Firestore
-            logger.info("Step 3: Fetching existing matches from Firestore")
-            existing_matches = self.firestore_manager.get_all_matches()
+                # Step 3: Fetch the existing matches present in the API response
+                logger.info("Step 3: Fetching existing matches from Firestore")
+                raw_entities = raw_response.get("response", [])
+                existing_matches = self.firestore_manager.get_matches_by_fixture_ids(
+                    entity["fixture"]["id"]
+                    for entity in raw_entities
+                    if "fixture" in entity
+                )
+
+                raw_document_id = store_future.result()
 
             # Step 4: Detect changes
             logger.info("Step 4: Detecting changes")
-            raw_entities = raw_response.get("response", [])
-            changeset = self.detect_changes(raw_entities, existing_matches)
+            changeset = self.detect_changes(
+                raw_entities, existing_matches, entity_type="fixtures"
+            )
 
             # Step 5: Resolve conflicts if any
             resolutions: List[Resolution] = []
@@ -288,12 +331,15 @@ class APIFootballSync:
             # Add new fixtures
             for entity in changeset.entities_to_add:
                 try:
-                    fixture_data = entity.get("fixture", {})
-                    teams_data = entity.get("teams", {})
+                    fixture_data = entity["fixture"]
 
                     # Handle TBD knockout matches gracefully (null team IDs)
-                    home_team_id = teams_data.get("home", {}).get("id")
-                    away_team_id = teams_data.get("away", {}).get("id")
+                    try:
+                        teams_data = entity["teams"]
+                        home_team_id = teams_data["home"]["id"]
+                        away_team_id = teams_data["away"]["id"]
+                    except (KeyError, TypeError):
+                        home_team_id = away_team_id = None
 
                     # Create match in Firestore
                     # Note: We'd need to map API-Football fixture to our Match dataclass
@@ -304,40 +350,27 @@ class APIFootballSync:
                     errors.append(error_msg)
                     logger.error(error_msg)
 
-            # Update existing fixtures (including unchanged to refresh timestamps)
-            for entity in changeset.entities_to_update:
-                try:
-                    fixture_data = entity.get("fixture", {})
-                    # Update match in Firestore
-                    # For now, just count it
-                    entities_updated += 1
-                except Exception as e:
-                    error_msg = f"Failed to update fixture: {e}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-
-            # Refresh unchanged entities (count as updated for sync purposes)
-            for entity in changeset.entities_unchanged:
-                try:
-                    fixture_data = entity.get("fixture", {})
-                    # Refresh fixture data in Firestore
-                    # For now, just count it
-                    entities_updated += 1
-                except Exception as e:
-                    error_msg = f"Failed to refresh fixture: {e}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-
-            # Apply conflict resolutions
-            for resolution in resolutions:
-                if resolution.action == "apply_api_update":
-                    try:
-                        # Apply API update
-                        entities_updated += 1
-                    except Exception as e:
-                        error_msg = f"Failed to apply resolution: {e}"
-                        errors.append(error_msg)
-                        logger.error(error_msg)
+            # Update changed fixtures and applied conflict resolutions in batched
+            # writes (unchanged fixtures are not rewritten)
+            updates = self._build_updates(
+                changeset,
+                resolutions,
+                existing_matches,
+                entity_type="fixtures",
+                raw_document_id=raw_document_id,
+                synced_at=synced_at,
+            )
+            try:
+                self.firestore_manager.upsert_matches_bulk(updates)
+                entities_updated = len(updates)
+                # One freshness marker instead of touching every unchanged fixture
+                self.firestore_manager.set_sync_metadata(
+                    "fixtures", league_id, season, synced_at
+                )
+            except Exception as e:
+                error_msg = f"Failed to update fixtures: {e}"
+                errors.append(error_msg)
+                logger.error(error_msg)
 
             # Step 7: Build and return SyncResult
             result = SyncResult(
@@ -350,7 +383,7 @@ class APIFootballSync:
                 conflicts_resolved=len(resolutions),
                 changes_detected=entities_added + entities_updated,
                 raw_document_id=raw_document_id,
-                synced_at=datetime.utcnow().isoformat(),
+                synced_at=synced_at,
                 errors=errors,
             )
 
@@ -377,93 +410,162 @@ class APIFootballSync:
                 conflicts_resolved=0,
                 changes_detected=0,
                 raw_document_id="",
-                synced_at=datetime.utcnow().isoformat(),
+                synced_at=synced_at,
                 errors=errors,
             )
 
+    def _build_updates(
+        self,
+        changeset: ChangeSet,
+        resolutions: List[Resolution],
+        existing_entities: List[Dict[str, Any]],
+        entity_type: str,
+        raw_document_id: str,
+        synced_at: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build partial Firestore documents for existing entities touched by a sync.
+
+        Covers changed entities and conflicts resolved with "apply_api_update"
+        (which also clear the manual override). Unchanged entities are skipped;
+        sync freshness is tracked by set_sync_metadata instead. Every document
+        stores the entity's content_hash for the next sync's change detection.
+
+        Args:
+            changeset: Detected changes
+            resolutions: Conflict resolutions, in changeset.conflicts order
+            existing_entities: Entities from Firestore
+            entity_type: "teams" or "fixtures"
+            raw_document_id: Raw API response document the data came from
+            synced_at: ISO8601 sync timestamp
+
+        Returns:
+            Partial documents with "id", ready for a merge upsert
+        """
+        spec = ENTITY_SPECS[entity_type]
+        entity_key, doc_field = spec.entity_key, spec.doc_field
+        doc_ids = {
+            entity[spec.id_field]: entity["id"]
+            for entity in existing_entities
+            if entity.get(spec.id_field)
+        }
+        sync_fields = {
+            "api_football_raw_id": raw_document_id,
+            "last_synced_at": synced_at,
+        }
+
+        hashes = changeset.content_hashes
+
+        updates = [
+            {
+                "id": doc_ids[entity[entity_key]["id"]],
+                doc_field: entity[entity_key].get(spec.api_field),
+                "content_hash": hashes[entity[entity_key]["id"]],
+                **sync_fields,
+            }
+            for entity in changeset.entities_to_update
+        ]
+        updates.extend(
+            {
+                "id": doc_ids[conflict.entity_id],
+                doc_field: conflict.api_value,
+                "manual_override": False,
+                "content_hash": hashes[conflict.entity_id],
+                **sync_fields,
+            }
+            for conflict, resolution in zip(changeset.conflicts, resolutions)
+            if resolution.action == "apply_api_update"
+        )
+
+        return updates
+
     def detect_changes(
         self,
         raw_entities: List[Dict[str, Any]],
         existing_entities: List[Dict[str, Any]],
+        entity_type: Optional[str] = None,
     ) -> ChangeSet:
         """
         Detect changes between API data and Firestore data.
 
+        An entity is unchanged when its content_hash matches the one stored by
+        the previous sync. Documents synced before hashes were stored fall
+        back to comparing the synced field (team name / fixture date). A
+        conflict is only raised when that field itself differs from a manual
+        override.
+
         Args:
-            raw_entities: Entities from API-Football
+            raw_entities: Entities from API-Football (all of one type)
             existing_entities: Entities from Firestore
+            entity_type: "teams" or "fixtures" (inferred from the first raw
+                entity if omitted)
 
         Returns:
             ChangeSet with categorized changes
         """
         changeset = ChangeSet()
+        if not raw_entities:
+            return changeset
+
+        if entity_type is None:
+            entity_type = "teams" if "team" in raw_entities[0] else "fixtures"
+        spec = ENTITY_SPECS[entity_type]
+        entity_key, api_field = spec.entity_key, spec.api_field
+        doc_field, id_field = spec.doc_field, spec.id_field
+
+        # Map existing entities by API-Football ID for fast lookup
+        existing_map = {
+            entity[id_field]: entity
+            for entity in existing_entities
+            if entity.get(id_field)
+        }
 
-        # Create mapping of existing entities by API-Football ID for fast lookup
-        existing_map: Dict[int, Dict[str, Any]] = {}
-        for entity in existing_entities:
-            # Extract API-Football ID from entity
-            api_id = entity.get("api_football_id")
-            if api_id:
-                existing_map[api_id] = entity
-
-        # Iterate through raw entities and categorize
         for raw_entity in raw_entities:
-            # Extract team/fixture ID from raw entity
-            if "team" in raw_entity:
-                # Teams entity
-                api_id = raw_entity["team"]["id"]
-            elif "fixture" in raw_entity:
-                # Fixtures entity
-                api_id = raw_entity["fixture"]["id"]
-            else:
-                # Unknown entity type - skip
+            api_entity = raw_entity.get(entity_key)
+            if api_entity is None:
+                # Not an entity of this type - skip
                 logger.warning(f"Unknown entity type in raw_entities: {raw_entity}")
                 continue
 
-            # Check if entity exists in Firestore
-            if api_id in existing_map:
-                # Entity exists - check if update needed
-                existing = existing_map[api_id]
-
-                # Compare values to detect changes
-                if "team" in raw_entity:
-                    api_name = raw_entity["team"].get("name")
-                    existing_name = existing.get("name")
-                elif "fixture" in raw_entity:
-                    api_date = raw_entity["fixture"].get("date")
-                    existing_date = existing.get("kickoff")
-                    api_name = api_date
-                    existing_name = existing_date
-                else:
-                    api_name = None
-                    existing_name = None
-
-                # Check for conflicts (manual override)
-                has_manual_override = existing.get("manual_override", False)
-
-                # Determine if there are actual changes
-                has_changes = api_name != existing_name
-
-                if has_changes and has_manual_override:
-                    # Conflict: API data differs from manually overridden data
-                    conflict = Conflict(
+            api_id = api_entity["id"]
+            digest = content_hash(raw_entity)
+            changeset.content_hashes[api_id] = digest
+
+            existing = existing_map.get(api_id)
+            if existing is None:
+                # New entity - add to list
+                changeset.entities_to_add.append(raw_entity)
+                continue
+
+            api_value = api_entity.get(api_field)
+            existing_value = existing.get(doc_field)
+
+            # Determine if there are actual changes
+            field_changed = api_value != existing_value
+            stored_hash = existing.get("content_hash")
+            if stored_hash is None:
+                has_changes = field_changed
+            else:
+                has_changes = digest != stored_hash
+
+            if has_changes and field_changed and existing.get("manual_override"):
+                # Conflict: API data differs from manually overridden data
+                changeset.conflicts.append(
+                    Conflict(
                         entity_id=api_id,
-                        entity_type="teams" if "team" in raw_entity else "fixtures",
-                        field="name" if "team" in raw_entity else "date",
-                        firestore_value=existing_name,
-                        api_value=api_name,
+                        entity_type=entity_type,
+                        field=spec.conflict_field,
+                        firestore_value=existing_value,
+                        api_value=api_value,
                         manual_override=True,
                     )
-                    changeset.conflicts.append(conflict)
-                elif has_changes:
-                    # Update needed (data changed, no manual override)
-                    changeset.entities_to_update.append(raw_entity)
-                else:
-                    # No changes detected
-                    changeset.entities_unchanged.append(raw_entity)
+                )
+            elif has_changes:
+                # Update needed (data changed, no manual override)
+                changeset.entities_to_update.append(raw_entity)
             else:
-                # New entity - add to list
-                changeset.entities_to_add.append(raw_entity)
+                # No changes detected
+                changeset.entities_unchanged.append(raw_entity)
 
         logger.info(
             f"Change detection: {len(changeset.entities_to_add)} to add, "
@@ -487,32 +589,26 @@ class APIFootballSync:
         Returns:
             List of resolutions
         """
-        resolutions: List[Resolution] = []
-
-        for conflict in conflicts:
-            if force_update:
-                # Force API update - clear manual override flag
-                resolution = Resolution(
-                    entity_id=conflict.entity_id,
-                    action="apply_api_update",
-                    manual_override_cleared=True,
-                )
-                logger.info(
-                    f"Conflict resolved: Force update for {conflict.entity_type} {conflict.entity_id} "
-                    f"(field={conflict.field}, old={conflict.firestore_value}, new={conflict.api_value})"
-                )
-            else:
-                # Preserve manual override
-                resolution = Resolution(
-                    entity_id=conflict.entity_id,
-                    action="preserve_override",
-                    manual_override_cleared=False,
-                )
-                logger.info(
-                    f"Conflict resolved: Preserving manual override for {conflict.entity_type} {conflict.entity_id} "
-                    f"(field={conflict.field}, keeping={conflict.firestore_value})"
+        # Force update applies the API value and clears the manual override;
+        # otherwise the manual override is preserved
+        action = "apply_api_update" if force_update else "preserve_override"
+        resolutions = [
+            Resolution(
+                entity_id=conflict.entity_id,
+                action=action,
+                manual_override_cleared=force_update,
+            )
+            for conflict in conflicts
+        ]
+
+        if conflicts:
+            logger.info(f"Resolved {len(conflicts)} conflicts as {action}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for conflict in conflicts:
+                logger.debug(
+                    f"Conflict {action} for {conflict.entity_type} {conflict.entity_id} "
+                    f"(field={conflict.field}, firestore={conflict.firestore_value}, "
+                    f"api={conflict.api_value})"
                 )
 
-            resolutions.append(resolution)
-
         return resolutions
@@ -11,6 +11,9 @@ project_root = Path(__file__).parent.parent.parent
 env_path = project_root / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Test environment (pytest module loaded): use test defaults, skip validation
+_IS_TEST = "pytest" in sys.modules
+
 
 class Config:
     """Application configuration loaded from environment variables
@@ -36,6 +39,9 @@ class Config:
     API_FOOTBALL_DELAY_SECONDS: float = 0.5
     MAX_RETRIES: int = 3
 
+    # Concurrent Firestore WriteBatch commits (network-bound)
+    FIRESTORE_WRITE_CONCURRENCY: int = 10
+
     # Development mode
     DEBUG: bool = False
 
@@ -49,15 +55,15 @@ class Config:
 
     def load_from_env(self):
         """Load configuration from environment variables"""
-        # Use test defaults if in test environment (pytest module loaded)
-        is_test = "pytest" in sys.modules
-
+        # Use test defaults if in test environment
         self.API_FOOTBALL_KEY = os.getenv(
-            "API_FOOTBALL_KEY", "test-key" if is_test else ""
+            "API_FOOTBALL_KEY", "test-key" if _IS_TEST else ""
+        )
+        self.GEMINI_API_KEY = os.getenv(
+            "GEMINI_API_KEY", "test-key" if _IS_TEST else ""
         )
-        self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "test-key" if is_test else "")
         self.FIRESTORE_PROJECT_ID = os.getenv(
-            "FIRESTORE_PROJECT_ID", "test-project" if is_test else ""
+            "FIRESTORE_PROJECT_ID", "test-project" if _IS_TEST else ""
         )
         self.BACKEND_API_KEY = os.getenv("BACKEND_API_KEY")
         self.GOOGLE_APPLICATION_CREDENTIALS = os.getenv(
@@ -71,6 +77,9 @@ class Config:
             os.getenv("API_FOOTBALL_DELAY_SECONDS", "0.5")
         )
         self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+        self.FIRESTORE_WRITE_CONCURRENCY = int(
+            os.getenv("FIRESTORE_WRITE_CONCURRENCY", "10")
+        )
         self.DEBUG = os.getenv("DEBUG", "").lower() in ("true", "1", "yes")
 
         # Database mode: default to Firestore unless explicitly disabled
@@ -82,8 +91,8 @@ class Config:
 
     def validate(self):
         """Validate that all required environment variables are set"""
-        # Skip validation in test environment (pytest module loaded)
-        if "pytest" in sys.modules:
+        # Skip validation in test environment
+        if _IS_TEST:
             return
 
         required_vars = {
@@ -9,19 +9,24 @@ Implements:
 - Exponential backoff retry logic
 """
 
+import copy
 import json
 import logging
 import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config import config
 from src.exceptions import APIRateLimitError, DataAggregationError
+from src.rate_limiter import AdaptiveTokenBucket
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,6 +35,97 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+# HTTP connection pool for API-Football (connections are reused across teams)
+API_FOOTBALL_HOST = "v3.football.api-sports.io"
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 16
+
+# Match result by sign of goal difference: 0 -> draw, 1 -> win, -1 -> loss
+MATCH_RESULTS = ("D", "W", "L")
+
+# Retries after the first attempt, with exponential backoff (seconds) before each
+MAX_RETRIES = 3
+RETRY_DELAYS = (1, 2, 4)
+
+# Maximum concurrent team fetches in fetch_team_stats_batch
+MAX_FETCH_WORKERS = 4
+
+# Longest total backoff per fetch, Retry-After included (seconds). A Retry-After
+# that would exceed it fails fast instead of stalling update_predictions.
+MAX_RETRY_WAIT = sum(RETRY_DELAYS)
+
+# Slowest pacing after repeated 429s: one request per this many seconds
+MAX_REQUEST_INTERVAL = 8.0
+
+# One request per API_FOOTBALL_DELAY_SECONDS (RULES.md: 0.5s), shared by every
+# DataAggregator in the process so separate instances cannot exceed it together.
+# 429s widen the interval (up to MAX_REQUEST_INTERVAL) and successes narrow it.
+_api_football_rate_limiter = AdaptiveTokenBucket(
+    rate=1 / config.API_FOOTBALL_DELAY_SECONDS,
+    capacity=1,
+    min_rate=1 / MAX_REQUEST_INTERVAL,
+)
+
+
+def _retry_after_seconds(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    Read the Retry-After header of a 429 response.
+
+    Args:
+        response: HTTP response (may be None)
+
+    Returns:
+        Seconds to wait, or None if absent or not in delta-seconds form
+    """
+    if response is None:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        return None
+
+
+def _rate_limit_delay(
+    error: APIRateLimitError, team_id: int, attempt: int, waited: float
+) -> float:
+    """
+    Decide how long to back off after a 429, or give up.
+
+    The server's Retry-After is preferred over the fixed schedule, but a wait
+    that would push the total past MAX_RETRY_WAIT fails fast instead.
+
+    Args:
+        error: Rate limit error from the failed attempt
+        team_id: Team being fetched (for the error message)
+        attempt: Zero-based number of the failed attempt
+        waited: Seconds already spent backing off for this fetch
+
+    Returns:
+        Seconds to sleep before the next attempt
+
+    Raises:
+        APIRateLimitError: If no retries are left or the wait exceeds the budget
+    """
+    if attempt == MAX_RETRIES:
+        raise APIRateLimitError(
+            f"Rate limit exceeded for team {team_id}",
+            retry_after=error.retry_after,
+        ) from error
+
+    if error.retry_after is None:
+        return RETRY_DELAYS[attempt]
+
+    if waited + error.retry_after > MAX_RETRY_WAIT:
+        raise APIRateLimitError(
+            f"Rate limit for team {team_id}: Retry-After "
+            f"{error.retry_after:g}s exceeds the retry budget",
+            retry_after=error.retry_after,
+        ) from error
+    return error.retry_after
+
 
 @dataclass
 class TeamStatistics:
@@ -54,7 +150,61 @@ class DataAggregator:
             cache_dir: Directory for local cache storage
         """
         self.cache_dir = cache_dir
-        self.last_request_time = 0.0
+        self.rate_limiter = _api_football_rate_limiter
+
+        # In-process copy of the local cache, keyed by (cache_key, YYYY-MM-DD)
+        self._mem_cache: Dict[Tuple[Union[int, str], str], Any] = {}
+        self._mem_cache_day = ""
+
+        # Today's date string, recomputed only once local midnight has passed
+        self._today_str = ""
+        self._today_expires_at = 0.0
+
+        # Pooled session so HTTPS connections are kept alive between requests.
+        # Retries are handled by the fetch methods, not urllib3.
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "x-rapidapi-key": config.API_FOOTBALL_KEY,
+                "x-rapidapi-host": API_FOOTBALL_HOST,
+            }
+        )
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=0,
+            ),
+        )
+
+    @property
+    def cache_dir(self) -> str:
+        """Directory for local cache storage."""
+        return str(self._cache_path)
+
+    @cache_dir.setter
+    def cache_dir(self, value: str) -> None:
+        self._cache_path = Path(value)
+        self._cache_dir_ready = False  # Created lazily on first save
+
+    def _today(self) -> str:
+        """
+        Today's local date as YYYY-MM-DD, formatted once per day.
+
+        Returns:
+            Date string used in cache file names
+        """
+        if time.time() >= self._today_expires_at:
+            now = datetime.now()
+            midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
+            self._today_str = now.strftime("%Y-%m-%d")
+            self._today_expires_at = midnight.timestamp()
+        return self._today_str
+
+    def close(self) -> None:
+        """Close the pooled HTTP session and release its connections."""
+        self._session.close()
 
     def transform_api_response(
         self, api_response: Dict[str, Any], team_id: int, fetch_xg: bool = False
@@ -92,56 +242,57 @@ class DataAggregator:
                 - xg: Optional[float] (may be None if not available)
                 - result: str ("W", "D", or "L")
         """
-        fixtures = []
+        fixtures: List[Dict[str, Any]] = []
+        append = fixtures.append
 
         for match in api_response.get("response", []):
-            # Determine if team was home or away
-            is_home = match["teams"]["home"]["id"] == team_id
-
             # Extract goals
-            goals_home = match["goals"]["home"]
-            goals_away = match["goals"]["away"]
+            goals = match["goals"]
+            goals_home = goals["home"]
+            goals_away = goals["away"]
 
             if goals_home is None or goals_away is None:
                 # Match not finished yet - skip
                 continue
 
-            # Determine result from team's perspective
-            if is_home:
-                goals_for = goals_home
-                goals_against = goals_away
-            else:
-                goals_for = goals_away
-                goals_against = goals_home
-
-            # Determine result
-            if goals_for > goals_against:
-                result = "W"
-            elif goals_for < goals_against:
-                result = "L"
+            # Determine result from team's perspective (home or away)
+            if match["teams"]["home"]["id"] == team_id:
+                goals_for, goals_against = goals_home, goals_away
             else:
-                result = "D"
+                goals_for, goals_against = goals_away, goals_home
 
-            # Extract xG if requested
-            xg = None
-            if fetch_xg:
-                fixture_id = match["fixture"]["id"]
-                stats = self.fetch_fixture_statistics(fixture_id)
-                if stats:
-                    xg = self.extract_xg_from_statistics(stats, team_id)
-                    if xg:
-                        logger.info(f"✅ xG extracted for fixture {fixture_id}: {xg}")
+            # Determine result from the sign of the goal difference
+            sign = (goals_for > goals_against) - (goals_for < goals_against)
+            result = MATCH_RESULTS[sign]
 
-            fixtures.append(
+            append(
                 {
                     "goals_for": goals_for,
                     "goals_against": goals_against,
-                    "xg": xg,
+                    "xg": None,
                     "result": result,
                     "fixture_id": match["fixture"]["id"],
                 }
             )
 
+        # Extract xG if requested, fetching all fixtures' statistics concurrently
+        if fetch_xg and fixtures:
+            fixture_ids = [fixture["fixture_id"] for fixture in fixtures]
+            workers = min(MAX_FETCH_WORKERS, len(fixture_ids))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                all_stats = list(
+                    executor.map(self.fetch_fixture_statistics, fixture_ids)
+                )
+
+            for fixture, stats in zip(fixtures, all_stats):
+                if stats:
+                    xg = self.extract_xg_from_statistics(stats, team_id)
+                    fixture["xg"] = xg
+                    if xg:
+                        logger.info(
+                            f"✅ xG extracted for fixture {fixture['fixture_id']}: {xg}"
+                        )
+
         return fixtures
 
     def compute_metrics(self, fixtures: List[Dict[str, Any]]) -> TeamStatistics:
@@ -158,17 +309,25 @@ class DataAggregator:
         Returns:
             TeamStatistics with calculated metrics
         """
-        # Extract xG values (exclude None)
-        xg_values = [f["xg"] for f in fixtures if f.get("xg") is not None]
-
-        # Calculate clean sheets
-        clean_sheets = sum(1 for f in fixtures if f.get("goals_against") == 0)
+        # Accumulate xG, clean sheets and results in a single pass
+        xg_sum = 0.0
+        xg_count = 0
+        clean_sheets = 0
+        results = []
+        for fixture in fixtures:
+            results.append(fixture["result"])
+            if fixture.get("goals_against") == 0:
+                clean_sheets += 1
+            xg = fixture.get("xg")
+            if xg is not None:
+                xg_sum += xg
+                xg_count += 1
 
         # Generate form string (reversed to show most recent first)
-        form_string = "-".join([f["result"] for f in reversed(fixtures)])
+        form_string = "-".join(reversed(results))
 
         # Handle missing xG data
-        if len(xg_values) == 0:
+        if xg_count == 0:
             # ALL matches missing xG - use fallback mode
             return TeamStatistics(
                 avg_xg=None,
@@ -180,8 +339,8 @@ class DataAggregator:
             )
 
         # Calculate metrics with available xG data
-        avg_xg = sum(xg_values) / len(xg_values)
-        data_completeness = len(xg_values) / len(fixtures)
+        avg_xg = xg_sum / xg_count
+        data_completeness = xg_count / len(fixtures)
 
         # Determine confidence level
         if data_completeness == 1.0:
@@ -205,22 +364,32 @@ class DataAggregator:
 
         Cache file naming: cache/team_stats_{cache_key}_{YYYY-MM-DD}.json
         Using date in filename naturally expires cache when day changes.
+        Entries already read or saved by this instance are served from memory.
 
         Args:
             cache_key: Team ID (int) or cache key string to load
 
         Returns:
-            Cached data (dict or list) or None if cache miss/expired
+            Shallow copy of the cached data (dict or list), so callers can add
+            fields without changing the cache, or None if cache miss/expired
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        cache_file = Path(self.cache_dir) / f"team_stats_{cache_key}_{today}.json"
+        today = self._today()
+        self._prune_mem_cache(today)
+
+        stats = self._mem_cache.get((cache_key, today))
+        if stats is not None:
+            logger.info(f"Cache HIT for {cache_key} (memory)")
+            return copy.copy(stats)
+
+        cache_file = self._cache_path / f"team_stats_{cache_key}_{today}.json"
 
         if cache_file.exists():
             try:
                 with open(cache_file, "r") as f:
                     stats = json.load(f)
+                    self._mem_cache[(cache_key, today)] = stats
                     logger.info(f"Cache HIT for {cache_key}")
-                    return stats
+                    return copy.copy(stats)
             except (json.JSONDecodeError, IOError) as e:
                 # Corrupted cache file - treat as miss
                 logger.warning(f"Cache file corrupted for {cache_key}: {e}")
@@ -233,27 +402,87 @@ class DataAggregator:
         """
         Save stats to local cache.
 
-        Creates cache directory if missing.
+        Creates cache directory if missing. The file is written to a temporary
+        name and renamed into place, so readers never see a partial file.
 
         Args:
             cache_key: Team ID (int) or cache key string
             stats: Statistics dictionary to cache
         """
         try:
-            # Create cache directory if it doesn't exist
-            cache_path = Path(self.cache_dir)
-            cache_path.mkdir(parents=True, exist_ok=True)
+            # Create cache directory on first save (or if it was removed since)
+            if not self._cache_dir_ready:
+                self._cache_path.mkdir(parents=True, exist_ok=True)
+                self._cache_dir_ready = True
 
-            today = datetime.now().strftime("%Y-%m-%d")
-            cache_file = cache_path / f"team_stats_{cache_key}_{today}.json"
+            today = self._today()
+            cache_file = self._cache_path / f"team_stats_{cache_key}_{today}.json"
 
-            with open(cache_file, "w") as f:
-                json.dump(stats, f, indent=2)
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self._cache_path, suffix=".tmp")
+            except FileNotFoundError:
+                self._cache_path.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self._cache_path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(stats, f, separators=(",", ":"))
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            self._prune_mem_cache(today)
+            self._mem_cache[(cache_key, today)] = copy.copy(stats)
 
             logger.info(f"Saved cache for {cache_key}")
         except (IOError, OSError) as e:
             logger.error(f"Failed to save cache for {cache_key}: {e}")
 
+    def _prune_mem_cache(self, today: str) -> None:
+        """Drop in-process cache entries from previous days."""
+        if today != self._mem_cache_day:
+            self._mem_cache = {
+                key: value for key, value in self._mem_cache.items() if key[1] == today
+            }
+            self._mem_cache_day = today
+
+    def warm(self, cache_keys: Optional[Iterable[Union[int, str]]] = None) -> int:
+        """
+        Preload today's local cache files into the in-process cache.
+
+        Args:
+            cache_keys: Cache keys to load. If None, every cache file written
+                today is loaded.
+
+        Returns:
+            Number of entries held in memory for today after warming
+        """
+        today = self._today()
+        self._prune_mem_cache(today)
+
+        if cache_keys is None:
+            suffix = f"_{today}.json"
+            cache_keys = []
+            for cache_file in self._cache_path.glob(f"team_stats_*{suffix}"):
+                key = cache_file.name[len("team_stats_") : -len(suffix)]
+                # Team stats are looked up by integer team ID
+                cache_keys.append(int(key) if key.isdigit() else key)
+
+        for cache_key in cache_keys:
+            if (cache_key, today) in self._mem_cache:
+                continue
+            cache_file = self._cache_path / f"team_stats_{cache_key}_{today}.json"
+            try:
+                with open(cache_file, "r") as f:
+                    self._mem_cache[(cache_key, today)] = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Cache file corrupted for {cache_key}: {e}")
+
+        logger.info(f"Warmed in-process cache with {len(self._mem_cache)} entries")
+        return len(self._mem_cache)
+
     def fetch_from_api(
         self, team_id: int, last: int = 5, next: int = 0
     ) -> Dict[str, Any]:
@@ -277,12 +506,6 @@ class DataAggregator:
         # API-Football v3 endpoint
         url = "https://v3.football.api-sports.io/fixtures"
 
-        # Request headers with API key
-        headers = {
-            "x-rapidapi-key": config.API_FOOTBALL_KEY,
-            "x-rapidapi-host": "v3.football.api-sports.io",
-        }
-
         # Query parameters: last N fixtures and/or next M fixtures for team
         params = {"team": team_id}
         if last > 0:
@@ -290,13 +513,16 @@ class DataAggregator:
         if next > 0:
             params["next"] = next
 
-        logger.debug(
-            f"Calling API-Football: GET {url}?team={team_id}&last={last}&next={next}"
-        )
+        # Debug logs on the per-team path are guarded so the f-strings are
+        # only built when DEBUG logging is actually enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Calling API-Football: GET {url}?team={team_id}&last={last}&next={next}"
+            )
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()  # Raise HTTPError for bad status codes
+            response = self._session.get(url, params=params, timeout=30)
+            self._check_response(response)
 
             data = response.json()
 
@@ -304,16 +530,20 @@ class DataAggregator:
             if "response" not in data:
                 raise ValueError(f"Unexpected API-Football response format: {data}")
 
-            logger.debug(
-                f"API-Football returned {len(data.get('response', []))} fixtures"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"API-Football returned {len(data.get('response', []))} fixtures"
+                )
             return data
 
         except requests.HTTPError as e:
             # Check for rate limit error (429)
             if e.response.status_code == 429:
                 logger.error(f"API-Football rate limit exceeded: {e}")
-                raise APIRateLimitError(f"API-Football rate limit (429): {e}") from e
+                raise APIRateLimitError(
+                    f"API-Football rate limit (429): {e}",
+                    retry_after=_retry_after_seconds(e.response),
+                ) from e
             else:
                 logger.error(f"API-Football HTTP error: {e}")
                 raise
@@ -328,7 +558,8 @@ class DataAggregator:
         Implements:
         - 0.5 second delay between requests (RULES.md requirement)
         - Exponential backoff on failures (1s, 2s, 4s)
-        - Max 3 retries
+        - Max 3 retries, waiting at most MAX_RETRY_WAIT in total (a longer
+          Retry-After raises APIRateLimitError right away)
         - Automatic metrics computation from API response
         - Optional xG fetching (costs extra API calls)
 
@@ -349,23 +580,18 @@ class DataAggregator:
             DataAggregationError: After 4 total attempts (max retries exceeded)
             APIRateLimitError: On 429 rate limit errors
         """
-        max_retries = 3
-        retry_delays = [1, 2, 4]
-
         logger.info(f"Fetching stats for team {team_id} (fetch_xg={fetch_xg})")
-        start_time = time.time()
+        start_time = time.monotonic()
 
-        for attempt in range(max_retries + 1):
+        error: Exception
+        waited = 0.0
+        for attempt in range(MAX_RETRIES + 1):
             # Rate limiting: 0.5s delay between requests
-            # Sleep on all requests except the very first one
-            if self.last_request_time > 0:
-                time.sleep(0.5)
-                logger.debug(f"Rate limit delay: 0.5s")
+            self._enforce_rate_limit()
 
             try:
                 # Fetch raw API response (last 5 matches)
                 api_response = self.fetch_from_api(team_id, last=5, next=0)
-                self.last_request_time = time.time()
 
                 # Transform API response to internal format (with optional xG fetching)
                 fixtures = self.transform_api_response(
@@ -386,43 +612,76 @@ class DataAggregator:
                     "has_real_data": True,  # Data fetched from API-Football
                 }
 
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 logger.info(
                     f"API call SUCCESS for team {team_id} (attempt {attempt + 1}, elapsed {elapsed:.2f}s, {len(fixtures)} fixtures)"
                 )
                 return result
 
-            except Exception as e:
-                error_msg = str(e)
-                elapsed = time.time() - start_time
-
-                # Check for rate limit error
-                if "429" in error_msg or "rate limit" in error_msg.lower():
-                    logger.warning(
-                        f"Rate limit hit for team {team_id} (attempt {attempt + 1})"
-                    )
-                    if attempt == max_retries:
-                        raise APIRateLimitError(
-                            f"Rate limit exceeded for team {team_id}"
-                        )
+            except APIRateLimitError as e:
+                logger.warning(
+                    f"Rate limit hit for team {team_id} (attempt {attempt + 1})"
+                )
+                delay = _rate_limit_delay(e, team_id, attempt, waited)
+                error = e
 
+            except Exception as e:
                 # On last attempt, raise final exception
-                if attempt == max_retries:
+                if attempt == MAX_RETRIES:
+                    elapsed = time.monotonic() - start_time
                     logger.error(
-                        f"API call FAILED for team {team_id} after {attempt + 1} attempts (elapsed {elapsed:.2f}s): {error_msg}"
+                        f"API call FAILED for team {team_id} after {attempt + 1} attempts (elapsed {elapsed:.2f}s): {e}"
                     )
                     raise DataAggregationError(team_id, "Max retries exceeded") from e
+                error = e
+                delay = RETRY_DELAYS[attempt]
 
-                # Exponential backoff
-                delay = retry_delays[attempt]
-                logger.warning(
-                    f"API call failed (attempt {attempt + 1}), retrying in {delay}s: {error_msg}"
-                )
-                time.sleep(delay)
+            # Exponential backoff
+            logger.warning(
+                f"API call failed (attempt {attempt + 1}), retrying in {delay}s: {error}"
+            )
+            time.sleep(delay)
+            waited += delay
 
         # Should never reach here, but satisfy type checker
         raise DataAggregationError(team_id, "Max retries exceeded")
 
+    def fetch_team_stats_batch(
+        self,
+        team_ids: List[int],
+        fetch_xg: bool = True,
+        max_workers: int = MAX_FETCH_WORKERS,
+    ) -> Dict[int, Union[Dict[str, Any], Exception]]:
+        """
+        Fetch statistics for many teams concurrently.
+
+        Each team goes through fetch_team_stats (rate limiting, retry) on a
+        thread pool sharing the pooled session, so request round-trips overlap
+        while request starts stay 0.5s apart.
+
+        Args:
+            team_ids: Team IDs to fetch
+            fetch_xg: If True, fetch xG from statistics endpoint
+            max_workers: Maximum concurrent API-Football requests
+
+        Returns:
+            Stats dictionaries keyed by team ID. A team whose fetch failed maps
+            to the exception it raised, so one failure does not sink the batch.
+        """
+        if not team_ids:
+            return {}
+
+        def fetch(team_id: int) -> Union[Dict[str, Any], Exception]:
+            try:
+                return self.fetch_team_stats(team_id, fetch_xg=fetch_xg)
+            except Exception as e:
+                logger.error(f"Batch fetch FAILED for team {team_id}: {e}")
+                return e
+
+        workers = min(max_workers, len(team_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(team_ids, executor.map(fetch, team_ids)))
+
     def fetch_team_fixtures(
         self, team_id: int, last: int = 5, next: int = 5
     ) -> Dict[str, Any]:
@@ -430,7 +689,7 @@ class DataAggregator:
         Fetch both past and upcoming fixtures for a team.
 
         NOTE: API-Football does not support using 'last' and 'next' parameters
-        together, so this method makes TWO separate API calls.
+        together, so this method makes TWO separate API calls, run concurrently.
 
         Args:
             team_id: API-Football team ID
@@ -448,19 +707,33 @@ class DataAggregator:
             APIRateLimitError: On 429 rate limit errors
         """
         logger.info(f"Fetching fixtures for team {team_id} (last={last}, next={next})")
-        start_time = time.time()
+        start_time = time.monotonic()
 
         past_fixtures = []
         upcoming_fixtures = []
 
-        # Fetch past fixtures (if requested)
-        if last > 0:
+        if last > 0 and next > 0:
+            # Both requested: overlap the two calls on the pooled session (the
+            # shared rate limiter still spaces their starts 0.5s apart)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                past_future = executor.submit(
+                    self._fetch_fixtures_by_type, team_id, last=last, fetch_type="past"
+                )
+                upcoming_future = executor.submit(
+                    self._fetch_fixtures_by_type,
+                    team_id,
+                    next=next,
+                    fetch_type="upcoming",
+                )
+                past_fixtures = past_future.result()
+                upcoming_fixtures = upcoming_future.result()
+        elif last > 0:
+            # Fetch past fixtures only
             past_fixtures = self._fetch_fixtures_by_type(
                 team_id, last=last, fetch_type="past"
             )
-
-        # Fetch upcoming fixtures (if requested)
-        if next > 0:
+        elif next > 0:
+            # Fetch upcoming fixtures only
             upcoming_fixtures = self._fetch_fixtures_by_type(
                 team_id, next=next, fetch_type="upcoming"
             )
@@ -471,7 +744,7 @@ class DataAggregator:
             "total_count": len(past_fixtures) + len(upcoming_fixtures),
         }
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         logger.info(
             f"Fixtures fetch SUCCESS for team {team_id} "
             f"(elapsed {elapsed:.2f}s, {len(past_fixtures)} past, {len(upcoming_fixtures)} upcoming)"
@@ -497,19 +770,15 @@ class DataAggregator:
             DataAggregationError: After max retries exceeded
             APIRateLimitError: On 429 rate limit errors
         """
-        max_retries = 3
-        retry_delays = [1, 2, 4]
-
-        for attempt in range(max_retries + 1):
+        error: Exception
+        waited = 0.0
+        for attempt in range(MAX_RETRIES + 1):
             # Rate limiting: 0.5s delay between requests
-            if self.last_request_time > 0:
-                time.sleep(0.5)
-                logger.debug(f"Rate limit delay: 0.5s")
+            self._enforce_rate_limit()
 
             try:
                 # Fetch raw API response
                 api_response = self.fetch_from_api(team_id, last=last, next=next)
-                self.last_request_time = time.time()
 
                 # Parse fixtures
                 fixtures = []
@@ -539,38 +808,36 @@ class DataAggregator:
 
                     fixtures.append(fixture_data)
 
-                logger.debug(
-                    f"Fetched {len(fixtures)} {fetch_type} fixtures for team {team_id}"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Fetched {len(fixtures)} {fetch_type} fixtures for team {team_id}"
+                    )
                 return fixtures
 
-            except Exception as e:
-                error_msg = str(e)
-
-                # Check for rate limit error
-                if "429" in error_msg or "rate limit" in error_msg.lower():
-                    logger.warning(
-                        f"Rate limit hit for team {team_id} (attempt {attempt + 1})"
-                    )
-                    if attempt == max_retries:
-                        raise APIRateLimitError(
-                            f"Rate limit exceeded for team {team_id}"
-                        )
+            except APIRateLimitError as e:
+                logger.warning(
+                    f"Rate limit hit for team {team_id} (attempt {attempt + 1})"
+                )
+                delay = _rate_limit_delay(e, team_id, attempt, waited)
+                error = e
 
+            except Exception as e:
                 # On last attempt, raise final exception
-                if attempt == max_retries:
+                if attempt == MAX_RETRIES:
                     logger.error(
                         f"{fetch_type.capitalize()} fixtures fetch FAILED for team {team_id} "
-                        f"after {attempt + 1} attempts: {error_msg}"
+                        f"after {attempt + 1} attempts: {e}"
                     )
                     raise DataAggregationError(team_id, "Max retries exceeded") from e
+                error = e
+                delay = RETRY_DELAYS[attempt]
 
-                # Exponential backoff
-                delay = retry_delays[attempt]
-                logger.warning(
-                    f"Fixtures fetch failed (attempt {attempt + 1}), retrying in {delay}s: {error_msg}"
-                )
-                time.sleep(delay)
+            # Exponential backoff
+            logger.warning(
+                f"Fixtures fetch failed (attempt {attempt + 1}), retrying in {delay}s: {error}"
+            )
+            time.sleep(delay)
+            waited += delay
 
         # Should never reach here, but satisfy type checker
         raise DataAggregationError(team_id, "Max retries exceeded")
@@ -609,8 +876,10 @@ class DataAggregator:
 
         try:
             logger.info(f"🌐 Fetching prediction for fixture {fixture_id}...")
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._session.get(
+                url, headers=headers, params=params, timeout=10
+            )
+            self._check_response(response)
 
             data = response.json()
 
@@ -665,8 +934,10 @@ class DataAggregator:
 
         try:
             logger.info(f"🌐 Fetching statistics for fixture {fixture_id}...")
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._session.get(
+                url, headers=headers, params=params, timeout=10
+            )
+            self._check_response(response)
 
             data = response.json()
 
@@ -724,11 +995,29 @@ class DataAggregator:
             return None
 
     def _enforce_rate_limit(self):
-        """Enforce 0.5 second delay between API requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < 0.5:
-            time.sleep(0.5 - elapsed)
-        self.last_request_time = time.time()
+        """
+        Enforce 0.5 second delay between API requests.
+
+        Draws from the process-wide token bucket, so all aggregators and batch
+        workers queue up one interval apart.
+        """
+        self.rate_limiter.acquire()
+
+    def _check_response(self, response: requests.Response) -> None:
+        """
+        Raise HTTPError for bad status codes and report the outcome to the
+        adaptive rate limiter (429 slows it down, success lets it recover).
+
+        Args:
+            response: API-Football HTTP response
+        """
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 429:
+                self.rate_limiter.on_throttled()
+            raise
+        self.rate_limiter.on_success()
 
     def fetch_teams(self, league_id: int, season: int) -> Dict[str, Any]:
         """
@@ -748,12 +1037,6 @@ class DataAggregator:
         # API-Football v3 endpoint
         url = "https://v3.football.api-sports.io/teams"
 
-        # Request headers with API key
-        headers = {
-            "x-rapidapi-key": config.API_FOOTBALL_KEY,
-            "x-rapidapi-host": "v3.football.api-sports.io",
-        }
-
         # Query parameters
         params = {"league": league_id, "season": season}
 
@@ -765,8 +1048,8 @@ class DataAggregator:
         self._enforce_rate_limit()
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._session.get(url, params=params, timeout=30)
+            self._check_response(response)
 
             data = response.json()
 
@@ -779,7 +1062,10 @@ class DataAggregator:
         except requests.HTTPError as e:
             if e.response.status_code == 429:
                 logger.error(f"API-Football rate limit exceeded: {e}")
-                raise APIRateLimitError(f"API-Football rate limit (429): {e}") from e
+                raise APIRateLimitError(
+                    f"API-Football rate limit (429): {e}",
+                    retry_after=_retry_after_seconds(e.response),
+                ) from e
             else:
                 logger.error(f"API-Football HTTP error: {e}")
                 raise
@@ -805,12 +1091,6 @@ class DataAggregator:
         # API-Football v3 endpoint
         url = "https://v3.football.api-sports.io/fixtures"
 
-        # Request headers with API key
-        headers = {
-            "x-rapidapi-key": config.API_FOOTBALL_KEY,
-            "x-rapidapi-host": "v3.football.api-sports.io",
-        }
-
         # Query parameters
         params = {"league": league_id, "season": season}
 
@@ -822,8 +1102,8 @@ class DataAggregator:
         self._enforce_rate_limit()
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._session.get(url, params=params, timeout=30)
+            self._check_response(response)
 
             data = response.json()
 
@@ -838,7 +1118,10 @@ class DataAggregator:
         except requests.HTTPError as e:
             if e.response.status_code == 429:
                 logger.error(f"API-Football rate limit exceeded: {e}")
-                raise APIRateLimitError(f"API-Football rate limit (429): {e}") from e
+                raise APIRateLimitError(
+                    f"API-Football rate limit (429): {e}",
+                    retry_after=_retry_after_seconds(e.response),
+                ) from e
             else:
                 logger.error(f"API-Football HTTP error: {e}")
                 raise
@@ -8,6 +8,8 @@ Provides specific exception types for:
 - Firestore operation failures
 """
 
+from typing import Optional
+
 
 class WorldCupAPIError(Exception):
     """Base exception for all World Cup API errors."""
@@ -18,8 +20,13 @@ class WorldCupAPIError(Exception):
 class APIRateLimitError(WorldCupAPIError):
     """Raised when API-Football rate limit is exceeded (429 error)."""
 
-    def __init__(self, message: str = "API rate limit exceeded"):
+    def __init__(
+        self,
+        message: str = "API rate limit exceeded",
+        retry_after: Optional[float] = None,
+    ):
         self.message = message
+        self.retry_after = retry_after  # Seconds from the Retry-After header
         super().__init__(self.message)
 
 
@@ -11,16 +11,45 @@ Features:
 """
 
 import hashlib
+import json
 import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from google.api_core import exceptions as google_exceptions
 from google.cloud import firestore
 from src.config import config
 
 logger = logging.getLogger(__name__)
 
+# Firestore hard limit on operations per WriteBatch commit
+MAX_BATCH_SIZE = 500
+
+# Firestore limit on values in one "in" filter
+MAX_IN_QUERY_VALUES = 30
+
+# Concurrent "in" queries when fetching documents by many IDs
+MAX_QUERY_WORKERS = 10
+
+# Raw API responses are stored as zlib-compressed JSON (rarely read back, and
+# repetitive JSON compresses several-fold); level 3 favours speed
+RAW_RESPONSE_ENCODING = "zlib+json"
+RAW_RESPONSE_ZLIB_LEVEL = 3
+
+# Backoff delays (seconds) between retries of a failed WriteBatch commit
+COMMIT_RETRY_DELAYS = (0.5, 1, 2, 4)
+
+# Commit errors worth retrying (contention, timeouts, temporary unavailability)
+TRANSIENT_COMMIT_ERRORS = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+)
+
 
 @dataclass
 class Team:
@@ -139,6 +168,67 @@ class FirestoreManager:
 
         return teams
 
+    def query_teams(
+        self, with_api_id: bool = False, exclude_placeholder: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Get teams, filtering on API-Football ID server-side by Firestore.
+
+        Placeholders are filtered in Python: an is_placeholder == False query
+        would also drop team documents written without the field.
+
+        Args:
+            with_api_id: Only return teams with an API-Football ID
+            exclude_placeholder: Skip placeholder teams (e.g. playoff winners)
+
+        Returns:
+            List of team dicts sorted by ID
+        """
+        query = self.teams_collection
+
+        if with_api_id:
+            query = query.where("api_football_id", "!=", None)
+
+        teams = [doc.to_dict() for doc in query.stream()]
+        if exclude_placeholder:
+            teams = [team for team in teams if not team.get("is_placeholder")]
+        teams.sort(key=lambda t: t.get("id", 0))
+
+        return teams
+
+    def get_teams_by_api_ids(self, api_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Get only the teams whose API-Football ID is in api_ids.
+
+        Args:
+            api_ids: API-Football team IDs
+
+        Returns:
+            List of team dicts (unordered)
+        """
+        return self._get_where_in(self.teams_collection, "api_football_id", api_ids)
+
+    def count_teams(self, with_field: Optional[str] = None) -> int:
+        """
+        Count teams with a server-side aggregation query (billed as one read).
+
+        Only one field filter is supported: two != filters on different fields
+        would need a composite index.
+
+        Args:
+            with_field: Only count teams where this field is set
+                (e.g. "api_football_id" or "stats")
+
+        Returns:
+            Number of matching team documents
+        """
+        query = self.teams_collection
+
+        if with_field:
+            query = query.where(with_field, "!=", None)
+
+        return self._count(query)
+
     def create_team(self, team: Team) -> None:
         """
         Create a new team.
@@ -165,6 +255,26 @@ class FirestoreManager:
 
         logger.info(f"Created team: {team.name} (ID: {team.id})")
 
+    def upsert_teams_bulk(self, teams: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge partial team documents into existing teams using batched writes.
+
+        Only the given fields are written; other fields are left untouched.
+
+        Args:
+            teams: Partial team dicts with at least "id" (list or generator)
+
+        Returns:
+            Number of teams written
+        """
+        written = self._commit_in_batches(
+            ((self.teams_collection.document(str(team["id"])), team) for team in teams),
+            merge=True,
+        )
+
+        logger.info(f"Upserted {written} teams (batched)")
+        return written
+
     def update_team_stats(
         self, team_id: int, stats: Dict[str, Any], ttl_hours: int = 24
     ) -> None:
@@ -192,6 +302,45 @@ class FirestoreManager:
 
         logger.info(f"Updated stats for team {team_id} (expires: {expires_at})")
 
+    def update_team_stats_bulk(
+        self, team_stats: Iterable[Tuple[int, Dict[str, Any]]], ttl_hours: int = 24
+    ) -> int:
+        """
+        Update stats for many teams using batched writes.
+
+        Same document shape as update_team_stats, but all teams share one
+        fetched_at/expires_at and are committed via WriteBatch.
+
+        Args:
+            team_stats: (team_id, stats) pairs
+            ttl_hours: Cache TTL in hours (default: 24)
+
+        Returns:
+            Number of teams updated
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=ttl_hours)
+
+        written = self._commit_in_batches(
+            (
+                (
+                    self.teams_collection.document(str(team_id)),
+                    {
+                        "stats": {
+                            **stats,
+                            "fetched_at": now,
+                            "expires_at": expires_at,
+                        }
+                    },
+                )
+                for team_id, stats in team_stats
+            ),
+            merge=True,
+        )
+
+        logger.info(f"Updated stats for {written} teams (expires: {expires_at})")
+        return written
+
     def get_team_stats(self, team_id: int) -> Optional[Dict[str, Any]]:
         """
         Get team stats with cache check.
@@ -274,6 +423,31 @@ class FirestoreManager:
 
         return matches
 
+    def get_matches_by_fixture_ids(
+        self, fixture_ids: Iterable[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get only the matches whose API-Football fixture ID is in fixture_ids.
+
+        Args:
+            fixture_ids: API-Football fixture IDs
+
+        Returns:
+            List of match dicts (unordered)
+        """
+        return self._get_where_in(
+            self.matches_collection, "api_football_fixture_id", fixture_ids
+        )
+
+    def count_matches(self) -> int:
+        """
+        Count matches with a server-side aggregation query (billed as one read).
+
+        Returns:
+            Number of match documents
+        """
+        return self._count(self.matches_collection)
+
     def get_matches_by_stage(self, stage_id: int) -> List[Dict[str, Any]]:
         """
         Get matches by stage.
@@ -329,8 +503,35 @@ class FirestoreManager:
 
         logger.info(f"Created match: {match.match_number}")
 
+    def upsert_matches_bulk(self, matches: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge partial match documents into existing matches using batched writes.
+
+        Only the given fields are written; other fields are left untouched.
+
+        Args:
+            matches: Partial match dicts with at least "id" (list or generator)
+
+        Returns:
+            Number of matches written
+        """
+        written = self._commit_in_batches(
+            (
+                (self.matches_collection.document(str(match["id"])), match)
+                for match in matches
+            ),
+            merge=True,
+        )
+
+        logger.info(f"Upserted {written} matches (batched)")
+        return written
+
     def update_match_prediction(
-        self, match_id: int, prediction: Dict[str, Any], team_stats_hash: str
+        self,
+        match_id: int,
+        prediction: Dict[str, Any],
+        team_stats_hash: str,
+        prompt_version: Optional[str] = None,
     ) -> None:
         """
         Update match prediction with cache metadata.
@@ -339,17 +540,20 @@ class FirestoreManager:
             match_id: Match ID
             prediction: Prediction dict from Gemini
             team_stats_hash: Hash of team stats used for prediction
+            prompt_version: Model + prompt template that produced the prediction
         """
         now = datetime.utcnow()
 
+        prediction_doc = {
+            **prediction,
+            "generated_at": now,
+            "team_stats_hash": team_stats_hash,
+        }
+        if prompt_version is not None:
+            prediction_doc["prompt_version"] = prompt_version
+
         self.matches_collection.document(str(match_id)).set(
-            {
-                "prediction": {
-                    **prediction,
-                    "generated_at": now,
-                    "team_stats_hash": team_stats_hash,
-                }
-            },
+            {"prediction": prediction_doc},
             merge=True,
         )
 
@@ -373,7 +577,10 @@ class FirestoreManager:
         return match.get("prediction")
 
     def should_regenerate_prediction(
-        self, match_id: int, current_stats_hash: str
+        self,
+        match_id: int,
+        current_stats_hash: str,
+        prompt_version: Optional[str] = None,
     ) -> bool:
         """
         Check if prediction should be regenerated based on team stats changes.
@@ -381,6 +588,7 @@ class FirestoreManager:
         Args:
             match_id: Match ID
             current_stats_hash: Hash of current team stats
+            prompt_version: Current model + prompt template (None skips the check)
 
         Returns:
             True if prediction should be regenerated
@@ -401,6 +609,13 @@ class FirestoreManager:
             logger.info(f"Stats changed for match {match_id}, regenerating prediction")
             return True
 
+        if (
+            prompt_version is not None
+            and prediction.get("prompt_version") != prompt_version
+        ):
+            logger.info(f"Prompt changed for match {match_id}, regenerating prediction")
+            return True
+
         logger.info(f"Stats unchanged for match {match_id}, using cached prediction")
         return False
 
@@ -464,6 +679,9 @@ class FirestoreManager:
         """
         Store raw API-Football response in Firestore.
 
+        The response is stored as zlib-compressed JSON bytes (content_encoding
+        RAW_RESPONSE_ENCODING); get_raw_api_response decodes it again.
+
         Args:
             entity_type: Type of entity (teams, fixtures, etc.)
             league_id: League ID
@@ -481,7 +699,11 @@ class FirestoreManager:
             "entity_type": entity_type,
             "league_id": league_id,
             "season": season,
-            "raw_response": raw_response,
+            "raw_response": zlib.compress(
+                json.dumps(raw_response, separators=(",", ":")).encode(),
+                RAW_RESPONSE_ZLIB_LEVEL,
+            ),
+            "content_encoding": RAW_RESPONSE_ENCODING,
             "fetched_at": datetime.utcnow(),
             "api_version": "v3",
             "endpoint": f"/teams" if entity_type == "teams" else f"/fixtures",
@@ -496,10 +718,35 @@ class FirestoreManager:
 
         return document_id
 
+    def set_sync_metadata(
+        self, entity_type: str, league_id: int, season: int, synced_at: str
+    ) -> None:
+        """
+        Record when an entity type was last synced for a league and season.
+
+        Stored on the matching raw API response document, so a sync that
+        changes nothing costs one write instead of one per unchanged entity.
+
+        Args:
+            entity_type: Type of entity (teams, fixtures, etc.)
+            league_id: League ID
+            season: Season year
+            synced_at: ISO8601 timestamp of the completed sync
+        """
+        document_id = f"{entity_type}_{league_id}_{season}"
+        self.raw_api_responses_collection.document(document_id).set(
+            {"last_synced_at": synced_at}, merge=True
+        )
+
+        logger.info(f"Recorded sync metadata: {document_id} (synced_at={synced_at})")
+
     def get_raw_api_response(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve raw API-Football response from Firestore by document ID.
 
+        Compressed responses are decoded; documents stored before compression
+        are returned as-is.
+
         Args:
             document_id: Document ID (format: "{entity_type}_{league_id}_{season}")
 
@@ -511,11 +758,154 @@ class FirestoreManager:
 
         if doc.exists:  # type: ignore[union-attr]
             logger.info(f"Retrieved raw API response: {document_id}")
-            return doc.to_dict()  # type: ignore[union-attr]
+            data = doc.to_dict()  # type: ignore[union-attr]
+            if data.get("content_encoding") == RAW_RESPONSE_ENCODING:
+                data["raw_response"] = json.loads(zlib.decompress(data["raw_response"]))
+            return data
 
         logger.info(f"Raw API response not found: {document_id}")
         return None
 
+    # ============================================================
+    # QUERY HELPERS
+    # ============================================================
+
+    @staticmethod
+    def _count(query: Any) -> int:
+        """
+        Run a count() aggregation on a collection or query.
+
+        Args:
+            query: Firestore collection reference or query
+
+        Returns:
+            Number of documents matched
+        """
+        return query.count().get()[0][0].value
+
+    @staticmethod
+    def _get_where_in(
+        collection: Any, field: str, values: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch documents whose field is in values, instead of a full scan.
+
+        Values are split into "in" queries of up to MAX_IN_QUERY_VALUES, which
+        are run concurrently.
+
+        Args:
+            collection: Firestore collection reference
+            field: Document field to filter on
+            values: Values to match (duplicates are ignored)
+
+        Returns:
+            List of document dicts (unordered)
+        """
+        unique = list(dict.fromkeys(values))
+        chunks = [
+            unique[i : i + MAX_IN_QUERY_VALUES]
+            for i in range(0, len(unique), MAX_IN_QUERY_VALUES)
+        ]
+        if not chunks:
+            return []
+
+        def fetch(chunk: List[Any]) -> List[Dict[str, Any]]:
+            query = collection.where(field, "in", chunk)
+            return [doc.to_dict() for doc in query.stream()]
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(chunks), MAX_QUERY_WORKERS)
+        ) as executor:
+            return [doc for docs in executor.map(fetch, chunks) for doc in docs]
+
+    # ============================================================
+    # BATCH HELPERS
+    # ============================================================
+
+    def _commit_in_batches(
+        self,
+        writes: Iterable[Tuple[Any, Dict[str, Any]]],
+        merge: bool = False,
+    ) -> int:
+        """
+        Apply document writes as WriteBatch commits of up to MAX_BATCH_SIZE ops.
+
+        Writes are consumed lazily: each batch is handed to the commit pool as
+        soon as it fills, so a generator of writes overlaps building documents
+        with committing earlier batches. Up to config.FIRESTORE_WRITE_CONCURRENCY
+        commits are in flight at once since each commit is a network round-trip
+        (threads are sufficient).
+
+        Transient commit errors are retried with backoff. Documents use
+        deterministic IDs, so re-running after a hard failure is safe.
+
+        Args:
+            writes: (document_ref, data) pairs to set (any iterable)
+            merge: Merge into existing documents instead of overwriting
+
+        Returns:
+            Number of documents written
+        """
+        futures = []
+        written = 0
+
+        with ThreadPoolExecutor(
+            max_workers=config.FIRESTORE_WRITE_CONCURRENCY
+        ) as executor:
+            batch = self.db.batch()
+            pending = 0
+
+            for doc_ref, data in writes:
+                batch.set(doc_ref, data, merge=merge)
+                pending += 1
+
+                if pending == MAX_BATCH_SIZE:
+                    futures.append(executor.submit(self._commit_with_retry, batch))
+                    written += pending
+                    batch = self.db.batch()
+                    pending = 0
+
+            if pending:
+                futures.append(executor.submit(self._commit_with_retry, batch))
+                written += pending
+
+            # Surface commit failures to the caller
+            for future in futures:
+                future.result()
+
+        return written
+
+    @staticmethod
+    def _commit_with_retry(batch: Any) -> List[Any]:
+        """
+        Commit a WriteBatch, retrying transient failures with backoff.
+
+        A failed commit leaves the batch's writes in place, so the same batch
+        can be committed again.
+
+        Args:
+            batch: Firestore WriteBatch to commit
+
+        Returns:
+            Write results from the successful commit
+
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: Non-transient errors,
+                or a transient error still failing after all retries
+        """
+        for attempt, delay in enumerate(COMMIT_RETRY_DELAYS, 1):
+            try:
+                return batch.commit()
+            except TRANSIENT_COMMIT_ERRORS as e:
+                logger.warning(
+                    f"Batch commit failed (attempt {attempt}): {e}. "
+                    f"Retrying in {delay}s"
+                )
+                time.sleep(delay)
+
+        # Final attempt: let any error propagate
+        return batch.commit()
+
     # ============================================================
     # CACHE HELPERS
     # ============================================================
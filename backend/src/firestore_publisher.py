@@ -11,13 +11,25 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from google.cloud import firestore
 from src.config import config
+from src.exceptions import FirestoreOperationError
 
 
 class FirestorePublisher:
     """Publish tournament predictions to Firestore with history tracking."""
 
-    def __init__(self):
-        """Initialize Firestore client."""
+    def __init__(self, db: Optional[firestore.Client] = None):
+        """
+        Initialize Firestore client.
+
+        Args:
+            db: Existing Firestore client to reuse (avoids opening a second
+                gRPC channel when the caller already holds one)
+        """
+        self.db: Optional[firestore.Client]
+        if db is not None:
+            self.db = db
+            return
+
         # Initialize Firestore client
         # In test environment, db will be mocked
         try:
@@ -26,6 +38,23 @@ class FirestorePublisher:
             # Allow tests to mock this
             self.db = None
 
+    def _client(self, operation: str) -> firestore.Client:
+        """
+        Return the Firestore client, or raise if it failed to initialize.
+
+        Args:
+            operation: Operation name for the error message
+
+        Returns:
+            Firestore client
+
+        Raises:
+            FirestoreOperationError: If no client is available
+        """
+        if self.db is None:
+            raise FirestoreOperationError(operation, "Firestore client not initialized")
+        return self.db
+
     def publish_snapshot(self, snapshot: Dict[str, Any]) -> None:
         """
         Publish tournament snapshot to predictions/latest document.
@@ -45,7 +74,11 @@ class FirestorePublisher:
         }
 
         # Publish to predictions/latest
-        doc_ref = self.db.collection("predictions").document("latest")
+        doc_ref = (
+            self._client("publish_snapshot")
+            .collection("predictions")
+            .document("latest")
+        )
         doc_ref.set(snapshot_with_timestamp)
 
     def should_save_prediction_history(
@@ -65,7 +98,8 @@ class FirestorePublisher:
         """
         # Fetch latest history entry
         history_ref = (
-            self.db.collection("matches")
+            self._client("should_save_prediction_history")
+            .collection("matches")
             .document(str(match_id))
             .collection("history")
             .order_by("timestamp", direction=firestore.Query.DESCENDING)
@@ -112,7 +146,8 @@ class FirestorePublisher:
 
         # Save to sub-collection
         history_ref = (
-            self.db.collection("matches")
+            self._client("save_prediction_history")
+            .collection("matches")
             .document(str(match_id))
             .collection("history")
             .document()  # Auto-generate document ID
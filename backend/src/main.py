@@ -12,14 +12,14 @@ import uuid
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from fastapi import FastAPI, HTTPException, Request, Depends, Security
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security.api_key import APIKeyHeader
 from pydantic import BaseModel
 
-from src.ai_agent import AIAgent
+from src.ai_agent import get_ai_agent
 from src.api_football_sync import APIFootballSync
 from src.config import config
 from src.data_aggregator import DataAggregator
@@ -28,7 +28,6 @@ from src.exceptions import (
     APIRateLimitError,
     DataAggregationError,
     FirestoreOperationError,
-    GeminiFailureError,
 )
 from src.fifa_engine import FifaEngine
 from src.fifa_ranking_scraper import FIFARankingScraper  # type: ignore[import-not-found]
@@ -353,17 +352,19 @@ def update_tournament() -> Dict[str, Any]:
         dark_horses = [standing.team_name for standing in third_place_qualifiers[:3]]
 
         # Build ALL matches (group stage + knockout)
+        # Index teams once instead of scanning the list for every match
+        teams_by_id = {team.id: team for team in teams}
         all_matches_data = []
         for match in all_matches:
             # Find team names (may be None for TBD knockout matches)
             home_team = (
-                next((t for t in teams if t.id == match.home_team_id), None)
-                if match.home_team_id
+                teams_by_id.get(match.home_team_id)
+                if match.home_team_id is not None
                 else None
             )
             away_team = (
-                next((t for t in teams if t.id == match.away_team_id), None)
-                if match.away_team_id
+                teams_by_id.get(match.away_team_id)
+                if match.away_team_id is not None
                 else None
             )
 
@@ -444,7 +445,7 @@ def update_tournament() -> Dict[str, Any]:
         # Step 6: Publish to Firestore
         logger.info("Step 6: Publishing to Firestore")
         try:
-            publisher = FirestorePublisher()
+            publisher = FirestorePublisher(db=fs_manager.db)
             publisher.publish_snapshot(snapshot)
             logger.info("Successfully published tournament snapshot to Firestore")
         except Exception as e:
@@ -476,6 +477,17 @@ def update_tournament() -> Dict[str, Any]:
         )
 
 
+def _fallback_team_stats() -> Dict[str, Any]:
+    """Placeholder stats for a team without usable API-Football data."""
+    return {
+        "avg_xg": None,
+        "clean_sheets": 0,
+        "form_string": "Unknown",
+        "confidence": "low",
+        "has_real_data": False,
+    }
+
+
 @app.post("/api/update-predictions", dependencies=[Depends(get_api_key)])
 def update_predictions() -> Dict[str, Any]:
     """
@@ -499,6 +511,9 @@ def update_predictions() -> Dict[str, Any]:
     logger.info("Predictions update pipeline started")
     pipeline_start = datetime.utcnow()
 
+    # Pooled API-Football session, closed when the pipeline finishes
+    aggregator = DataAggregator()
+
     try:
         errors: List[str] = []
         warnings: List[str] = []
@@ -552,11 +567,13 @@ def update_predictions() -> Dict[str, Any]:
 
         # Step 2: Fetch team statistics with smart caching (Firestore)
         logger.info("Step 2: Fetching team statistics with smart caching")
-        aggregator = DataAggregator()
         team_stats: Dict[int, Dict[str, Any]] = {}
         firestore_cache_hits = 0
         firestore_cache_misses = 0
 
+        # (team, API-Football ID) for teams that missed the Firestore cache
+        teams_to_fetch: List[Tuple[TeamDataclass, int]] = []
+
         for team in teams:
             if team.is_placeholder:
                 continue
@@ -574,28 +591,14 @@ def update_predictions() -> Dict[str, Any]:
                     team_stats[team.id]["has_real_data"] = has_api_football_id
                     firestore_cache_hits += 1
                 else:
-                    # Cache MISS - fetch from API-Football
+                    # Cache MISS - fetch from API-Football below
                     firestore_cache_misses += 1
 
-                    if has_api_football_id and team.api_football_id is not None:
-                        # Fetch real data from API-Football (with xG enabled)
-                        stats = aggregator.fetch_team_stats(
-                            team.api_football_id, fetch_xg=True
-                        )
-                        stats["has_real_data"] = True
-                        team_stats[team.id] = stats
-
-                        # Update Firestore cache (24-hour TTL)
-                        fs_manager.update_team_stats(team.id, stats, ttl_hours=24)
+                    if team.api_football_id is not None:
+                        teams_to_fetch.append((team, team.api_football_id))
                     else:
                         # Use fallback stats for teams without API-Football ID
-                        fallback_stats = {
-                            "avg_xg": None,
-                            "clean_sheets": 0,
-                            "form_string": "Unknown",
-                            "confidence": "low",
-                            "has_real_data": False,
-                        }
+                        fallback_stats = _fallback_team_stats()
                         team_stats[team.id] = fallback_stats
 
                         # Cache fallback stats too (shorter TTL)
@@ -603,32 +606,52 @@ def update_predictions() -> Dict[str, Any]:
                             team.id, fallback_stats, ttl_hours=6
                         )
 
-            except (APIRateLimitError, DataAggregationError) as e:
-                error_msg = f"Failed to fetch stats for {team.name}: {str(e)}"
+            except Exception as e:
+                warning_msg = (
+                    f"Unexpected error fetching stats for {team.name}: {str(e)}"
+                )
+                warnings.append(warning_msg)
+                logger.warning(warning_msg)
+                # Fallback to mock data
+                team_stats[team.id] = _fallback_team_stats()
+
+        # Fetch real data from API-Football (with xG enabled) for all cache
+        # misses at once, so request round-trips overlap
+        fetched_stats = aggregator.fetch_team_stats_batch(
+            [api_football_id for _, api_football_id in teams_to_fetch], fetch_xg=True
+        )
+
+        for team, api_football_id in teams_to_fetch:
+            stats = fetched_stats[api_football_id]
+
+            if isinstance(stats, (APIRateLimitError, DataAggregationError)):
+                error_msg = f"Failed to fetch stats for {team.name}: {str(stats)}"
                 errors.append(error_msg)
                 logger.error(error_msg)
                 # Fallback to mock data
-                team_stats[team.id] = {
-                    "avg_xg": None,
-                    "clean_sheets": 0,
-                    "form_string": "Unknown",
-                    "confidence": "low",
-                    "has_real_data": False,
-                }
-            except Exception as e:
+                team_stats[team.id] = _fallback_team_stats()
+                continue
+
+            if isinstance(stats, Exception):
                 warning_msg = (
-                    f"Unexpected error fetching stats for {team.name}: {str(e)}"
+                    f"Unexpected error fetching stats for {team.name}: {str(stats)}"
                 )
                 warnings.append(warning_msg)
                 logger.warning(warning_msg)
                 # Fallback to mock data
-                team_stats[team.id] = {
-                    "avg_xg": None,
-                    "clean_sheets": 0,
-                    "form_string": "Unknown",
-                    "confidence": "low",
-                    "has_real_data": False,
-                }
+                team_stats[team.id] = _fallback_team_stats()
+                continue
+
+            stats["has_real_data"] = True
+            team_stats[team.id] = stats
+
+            try:
+                # Update Firestore cache (24-hour TTL)
+                fs_manager.update_team_stats(team.id, stats, ttl_hours=24)
+            except Exception as e:
+                warning_msg = f"Failed to cache stats for {team.name}: {str(e)}"
+                warnings.append(warning_msg)
+                logger.warning(warning_msg)
 
         logger.info(
             f"Team stats: {firestore_cache_hits} Firestore cache hits, "
@@ -686,13 +709,18 @@ def update_predictions() -> Dict[str, Any]:
 
         # Step 3: Generate AI predictions for all matches (with smart caching)
         logger.info("Step 3: Generating AI predictions with smart caching")
-        agent = AIAgent()
+        agent = get_ai_agent()
+        teams_by_id = {team.id: team for team in teams}
         predictions: List[Dict[str, Any]] = []
         gemini_success = 0
         gemini_fallback = 0
+        predictions_direct = 0
         predictions_cached = 0
         predictions_regenerated = 0
 
+        # Matchups needing a new prediction: (match, matchup, stats hash, real data)
+        pending: List[Tuple[Any, Dict[str, Any], str, bool]] = []
+
         for match in all_matches:
             # Skip matches with placeholder teams
             if match.home_team_id is None or match.away_team_id is None:
@@ -700,8 +728,8 @@ def update_predictions() -> Dict[str, Any]:
 
             try:
                 # Find team names
-                home_team = next((t for t in teams if t.id == match.home_team_id), None)
-                away_team = next((t for t in teams if t.id == match.away_team_id), None)
+                home_team = teams_by_id.get(match.home_team_id)
+                away_team = teams_by_id.get(match.away_team_id)
 
                 if not home_team or not away_team:
                     continue
@@ -717,7 +745,7 @@ def update_predictions() -> Dict[str, Any]:
 
                 # Check if we need to regenerate prediction
                 should_regenerate = fs_manager.should_regenerate_prediction(
-                    match.id, current_stats_hash
+                    match.id, current_stats_hash, prompt_version=agent.prompt_version
                 )
 
                 if not should_regenerate:
@@ -781,17 +809,38 @@ def update_predictions() -> Dict[str, Any]:
                     "api_football_prediction": api_football_prediction,
                 }
 
-                # Generate NEW prediction with Gemini
-                prediction = agent.generate_prediction(matchup)
+                pending.append(
+                    (match, matchup, current_stats_hash, match_has_real_data)
+                )
 
+            except Exception as e:
+                error_msg = f"Failed to predict match {match.match_number}: {str(e)}"
+                errors.append(error_msg)
+                logger.error(error_msg)
+
+        # Generate NEW predictions with Gemini (concurrently); a failed matchup
+        # falls back to the rule-based prediction and is reported in errors
+        new_predictions = agent.generate_predictions_batch(
+            [matchup for _, matchup, _, _ in pending], errors=errors
+        )
+
+        for (match, _, current_stats_hash, match_has_real_data), prediction in zip(
+            pending, new_predictions
+        ):
+            try:
                 # Save prediction to Firestore with stats hash
                 fs_manager.update_match_prediction(
-                    match.id, prediction, current_stats_hash
+                    match.id,
+                    prediction,
+                    current_stats_hash,
+                    prompt_version=agent.prompt_version,
                 )
 
-                # Track if fallback was used
+                # Track if fallback was used or Gemini was skipped
                 if prediction.get("confidence") == "low":
                     gemini_fallback += 1
+                elif prediction.get("source") == "direct":
+                    predictions_direct += 1
                 else:
                     gemini_success += 1
 
@@ -804,25 +853,23 @@ def update_predictions() -> Dict[str, Any]:
                     }
                 )
 
-            except GeminiFailureError as e:
-                error_msg = (
-                    f"Gemini prediction failed for match {match.match_number}: {str(e)}"
-                )
-                errors.append(error_msg)
-                logger.error(error_msg)
             except Exception as e:
-                error_msg = f"Failed to predict match {match.match_number}: {str(e)}"
+                error_msg = f"Failed to save prediction for match {match.match_number}: {str(e)}"
                 errors.append(error_msg)
                 logger.error(error_msg)
 
+        # Keep match order (cached and regenerated predictions were collected apart)
+        predictions.sort(key=lambda p: p["match_number"])
+
         logger.info(
             f"Predictions: {predictions_cached} cached (reused), "
-            f"{predictions_regenerated} regenerated ({gemini_success} Gemini success, {gemini_fallback} fallback)"
+            f"{predictions_regenerated} regenerated ({gemini_success} Gemini success, "
+            f"{gemini_fallback} fallback, {predictions_direct} direct)"
         )
 
         # Step 4: Fetch existing tournament data from Firestore and update with predictions
         try:
-            publisher = FirestorePublisher()
+            publisher = FirestorePublisher(db=fs_manager.db)
             if publisher.db is None:
                 raise HTTPException(
                     status_code=500,
@@ -871,17 +918,14 @@ def update_predictions() -> Dict[str, Any]:
                 team_win_prob = {}
                 group_stage_count = 0
 
+                # Index snapshot matches once instead of scanning per prediction
+                snapshot_matches_by_id = {
+                    m.get("id"): m for m in snapshot.get("matches", [])
+                }
+
                 for pred in predictions:
                     # Find the match data to get stage_id
-                    match_id = pred.get("match_id")
-                    match_data = next(
-                        (
-                            m
-                            for m in snapshot.get("matches", [])
-                            if m.get("id") == match_id
-                        ),
-                        None,
-                    )
+                    match_data = snapshot_matches_by_id.get(pred.get("match_id"))
 
                     # Only process group stage matches (stage_id = 1)
                     if match_data and match_data.get("stage_id") == 1:
@@ -938,18 +982,11 @@ def update_predictions() -> Dict[str, Any]:
                         group_predictions = []
                         for pred in predictions:
                             # Find the match data to get team names
-                            match_id = pred.get("match_id")
-                            match_data = next(
-                                (
-                                    m
-                                    for m in snapshot.get("matches", [])
-                                    if m.get("id") == match_id
-                                    and m.get("stage_id") == 1
-                                ),
-                                None,
+                            match_data = snapshot_matches_by_id.get(
+                                pred.get("match_id")
                             )
 
-                            if match_data:
+                            if match_data and match_data.get("stage_id") == 1:
                                 home_team = match_data.get("home_team_name")
                                 away_team = match_data.get("away_team_name")
 
@@ -1033,6 +1070,7 @@ def update_predictions() -> Dict[str, Any]:
             "predictions_generated": len(predictions),
             "gemini_success": gemini_success,
             "gemini_fallback": gemini_fallback,
+            "predictions_direct": predictions_direct,
             "firestore_cache_hits": firestore_cache_hits,
             "firestore_cache_misses": firestore_cache_misses,
             "predictions_cached": predictions_cached,
@@ -1054,6 +1092,8 @@ def update_predictions() -> Dict[str, Any]:
         raise HTTPException(
             status_code=500, detail=f"Prediction pipeline failed: {str(e)}"
         )
+    finally:
+        aggregator.close()
 
 
 @app.post("/api/sync-api-football", dependencies=[Depends(get_api_key)])
@@ -1082,10 +1122,12 @@ def sync_api_football(request: SyncRequest) -> Dict[str, Any]:
         f"force_update={request.force_update}"
     )
 
+    # Pooled API-Football session, closed once the sync finishes
+    data_aggregator = DataAggregator()
+
     try:
         # Initialize dependencies
         firestore_manager = FirestoreManager()
-        data_aggregator = DataAggregator()
         sync = APIFootballSync(firestore_manager, data_aggregator)
 
         # Route based on entity_type
@@ -1136,6 +1178,8 @@ def sync_api_football(request: SyncRequest) -> Dict[str, Any]:
         raise HTTPException(
             status_code=500, detail=f"API-Football sync failed: {str(e)}"
         )
+    finally:
+        data_aggregator.close()
 
 
 @app.post("/api/sync-match-flags", dependencies=[Depends(get_api_key)])
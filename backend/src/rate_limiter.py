@@ -0,0 +1,110 @@
+"""
+Thread-safe token-bucket rate limiting for outbound API calls.
+
+Unlike a fixed delay between requests, a token bucket lets callers burst up
+to its capacity and then paces them at the sustained rate, so concurrent
+workers can use the full request budget without exceeding it.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second, holding up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Sustained requests per second
+            capacity: Maximum burst size (tokens available at once)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+
+        The token is reserved under the lock (the balance may go negative) and
+        the wait happens outside it, so concurrent callers queue up in order
+        without holding each other up.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            logger.debug(f"Rate limiting: sleeping {wait:.2f}s")
+            time.sleep(wait)
+
+        return wait
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket that adapts its rate to server throttling (AIMD).
+
+    Each throttled response halves the rate, down to `min_rate`. After
+    `recovery_successes` successful responses in a row, the rate grows by
+    1 / `recovery_factor`, back up to the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: float,
+        recovery_successes: int = 5,
+        recovery_factor: float = 0.9,
+    ):
+        """
+        Initialize a full bucket running at its maximum rate.
+
+        Args:
+            rate: Maximum sustained requests per second
+            capacity: Maximum burst size (tokens available at once)
+            min_rate: Lowest rate to back off to
+            recovery_successes: Consecutive successes before speeding up
+            recovery_factor: Interval multiplier applied on each recovery step
+        """
+        super().__init__(rate, capacity)
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.recovery_successes = recovery_successes
+        self.recovery_factor = recovery_factor
+        self._successes = 0
+
+    def on_throttled(self) -> None:
+        """Halve the rate after a throttled (429) response."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._successes = 0
+            rate = self.rate
+        logger.warning(f"Throttled: slowing down to {rate:.2f} requests/s")
+
+    def on_success(self) -> None:
+        """Count a successful response and speed up after enough in a row."""
+        with self._lock:
+            if self.rate >= self.max_rate:
+                return
+            self._successes += 1
+            if self._successes >= self.recovery_successes:
+                self.rate = min(self.max_rate, self.rate / self.recovery_factor)
+                self._successes = 0
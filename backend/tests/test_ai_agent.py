@@ -1,6 +1,11 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from src.ai_agent import AIAgent
+from src.ai_agent import (
+    GENAI_VERSION,
+    PREDICTION_SCHEMA_INSTRUCTION,
+    AIAgent,
+    get_ai_agent,
+)
 
 
 def test_generate_prediction_basic():
@@ -45,6 +50,21 @@ def test_parse_markdown_json():
     assert parsed["winner"] == "Draw"
 
 
+def test_parse_plain_fence_and_unwrapped_json():
+    """Test parsing bare ``` fences and responses without any fence."""
+    agent = AIAgent()
+    assert agent._parse_response('```\n{"winner": "USA"}```')["winner"] == "USA"
+    assert agent._parse_response('  {"winner": "USA"}\n')["winner"] == "USA"
+
+
+def test_parse_ignores_text_after_json_object():
+    """Test that stray text before or after the JSON object is ignored."""
+    agent = AIAgent()
+    text = 'Here you go:\n{"winner": "USA", "reasoning": "a {b}"}\nHope this helps!'
+    parsed = agent._parse_response(text)
+    assert parsed == {"winner": "USA", "reasoning": "a {b}"}
+
+
 def test_retry_strategy_success_on_retry():
     """CRITICAL TEST: Retry strategy - success on second attempt."""
     agent = AIAgent()
@@ -88,6 +108,43 @@ def test_fallback_to_rule_based():
     mock_fallback.assert_called_once()
 
 
+def test_failed_matchup_skips_gemini_until_ttl_expires():
+    """Test matchups that exhausted their retries are not resent within the TTL."""
+    agent = AIAgent()
+    matchup = {"home_team": {"name": "USA"}, "away_team": {"name": "England"}}
+    mock_call = MagicMock(side_effect=Exception("Gemini Permanent Error"))
+
+    with patch.object(agent, "call_gemini", mock_call), patch("time.sleep"):
+        agent.generate_prediction(matchup)
+        prediction = agent.generate_prediction(matchup)
+
+    assert prediction["confidence"] == "low"
+    assert mock_call.call_count == 2
+
+
+def test_rate_limit_retried_only_when_retry_delay_is_short():
+    """Test 429s wait and retry for a short retryDelay, else fall back."""
+    agent = AIAgent()
+    matchup = {"home_team": {"name": "USA"}, "away_team": {"name": "England"}}
+
+    short = Exception("429 RESOURCE_EXHAUSTED {'retryDelay': '2s'}")
+    mock_call = MagicMock(side_effect=[short, MagicMock(text='{"winner": "USA"}')])
+    with patch.object(agent, "call_gemini", mock_call), patch("time.sleep") as sleep:
+        prediction = agent.generate_prediction(matchup)
+    assert prediction["winner"] == "USA"
+    assert 2 <= sleep.call_args.args[0] <= 3
+
+    long = Exception("429 RESOURCE_EXHAUSTED {'retryDelay': '40s'}")
+    mock_call = MagicMock(side_effect=long)
+    with patch.object(agent, "call_gemini", mock_call), patch("time.sleep") as sleep:
+        prediction = agent.generate_prediction(
+            {**matchup, "home_team": {"name": "Mexico"}}
+        )
+    assert prediction["confidence"] == "low"
+    assert mock_call.call_count == 1
+    sleep.assert_not_called()
+
+
 def test_rule_based_logic():
     """Test rule-based prediction logic using xG differential."""
     agent = AIAgent()
@@ -102,3 +159,212 @@ def test_rule_based_logic():
     assert prediction["winner"] == "USA"
     assert prediction["win_probability"] > 0.5
     assert prediction["confidence"] == "low"
+
+
+def test_gemini_client_built_lazily():
+    """Test the Gemini client is only constructed when first accessed."""
+    agent = AIAgent()
+    assert "client" not in agent.__dict__
+    assert "model" not in agent.__dict__
+
+    agent.rule_based_prediction(
+        {"home_team": {"name": "USA"}, "away_team": {"name": "England"}}
+    )
+    assert "client" not in agent.__dict__
+
+
+def test_get_ai_agent_returns_shared_instance():
+    """Test get_ai_agent reuses one agent for the whole process."""
+    agent = get_ai_agent()
+    assert isinstance(agent, AIAgent)
+    assert get_ai_agent() is agent
+
+
+def test_lopsided_matchup_skips_gemini():
+    """Test large xG gaps backed by form are predicted without Gemini."""
+    agent = AIAgent()
+    matchup = {
+        "home_team": {"name": "Brazil", "avg_xg": 2.6, "form_string": "W-W-D-W-W"},
+        "away_team": {"name": "Haiti", "avg_xg": 0.8, "form_string": "L-L-W-L-D"},
+    }
+    mock_call = MagicMock(return_value=MagicMock(text='{"winner": "Brazil"}'))
+
+    with patch.object(agent, "call_gemini", mock_call):
+        prediction = agent.generate_prediction(matchup)
+        matchup["away_team"]["form_string"] = "L-D-W-L-D"
+        agent.generate_prediction(matchup)
+
+    assert prediction["winner"] == "Brazil"
+    assert prediction["confidence"] == "high"
+    assert prediction["source"] == "direct"
+    # Mixed underdog form is not decisive enough, so Gemini is asked
+    mock_call.assert_called_once()
+
+
+def test_identical_matchup_served_from_cache():
+    """Test repeated matchups reuse the cached Gemini prediction."""
+    agent = AIAgent()
+    matchup = {
+        "match_id": 1,
+        "home_team": {"name": "USA", "avg_xg": 2.1},
+        "away_team": {"name": "England", "avg_xg": 1.8},
+    }
+
+    mock_call = MagicMock(return_value=MagicMock(text='{"winner": "USA"}'))
+
+    with patch.object(agent, "call_gemini", mock_call):
+        first = agent.generate_prediction(matchup)
+        first["winner"] = "mutated by caller"
+        second = agent.generate_prediction(
+            {**matchup, "match_id": 2, "match_number": 2}
+        )
+
+    assert second["winner"] == "USA"
+    assert mock_call.call_count == 1
+
+
+def test_fallback_predictions_not_cached():
+    """Test rule-based fallbacks are not cached so Gemini is retried later."""
+    agent = AIAgent()
+    matchup = {"home_team": {"name": "USA"}, "away_team": {"name": "England"}}
+
+    mock_call = MagicMock(
+        side_effect=[
+            Exception("Gemini Error"),
+            Exception("Gemini Error"),
+            MagicMock(text='{"winner": "England"}'),
+        ]
+    )
+
+    with patch.object(agent, "call_gemini", mock_call), patch("time.sleep"):
+        fallback = agent.generate_prediction(matchup)
+        # Once the failure TTL expires, Gemini is tried again
+        agent._negative_cache.clear()
+        prediction = agent.generate_prediction(matchup)
+
+    assert fallback["confidence"] == "low"
+    assert prediction["winner"] == "England"
+    assert mock_call.call_count == 3
+
+
+def test_negative_cache_prunes_expired_entries_on_insert():
+    """Test recording a failure drops entries whose TTL has expired."""
+    import time
+
+    agent = AIAgent()
+    agent._negative_cache[b"stale"] = time.monotonic() - 1
+    agent._negative_cache[b"active"] = time.monotonic() + 60
+
+    agent._mark_failed(b"new")
+
+    assert set(agent._negative_cache) == {b"active", b"new"}
+
+
+def test_near_identical_stats_share_cached_prediction():
+    """Test xG noise and non-prompt fields don't defeat the prediction cache."""
+    agent = AIAgent()
+    matchup = {
+        "home_team": {"name": "USA", "avg_xg": 1.234, "fetched_at": "2026-06-01"},
+        "away_team": {"name": "England", "avg_xg": 1.8},
+    }
+    near_duplicate = {
+        "home_team": {"name": "USA", "avg_xg": 1.236, "fetched_at": "2026-06-02"},
+        "away_team": {"name": "England", "avg_xg": 1.8},
+    }
+
+    mock_call = MagicMock(return_value=MagicMock(text='{"winner": "USA"}'))
+
+    with patch.object(agent, "call_gemini", mock_call):
+        agent.generate_prediction(matchup)
+        prediction = agent.generate_prediction(near_duplicate)
+
+    assert prediction["winner"] == "USA"
+    assert mock_call.call_count == 1
+
+
+def test_generate_predictions_batch_preserves_order():
+    """Test batch predictions run through generate_prediction in input order."""
+    agent = AIAgent()
+    matchups = [
+        {"home_team": {"name": f"Home {i}"}, "away_team": {"name": f"Away {i}"}}
+        for i in range(5)
+    ]
+
+    def fake_gemini(matchup):
+        return MagicMock(text=f'{{"winner": "{matchup["home_team"]["name"]}"}}')
+
+    with patch.object(agent, "call_gemini", side_effect=fake_gemini) as mock_call:
+        predictions = agent.generate_predictions_batch(matchups)
+
+    assert [p["winner"] for p in predictions] == [f"Home {i}" for i in range(5)]
+    assert mock_call.call_count == 5
+    assert agent.generate_predictions_batch([]) == []
+
+
+def test_generate_predictions_batch_falls_back_per_matchup():
+    """Test one failing matchup gets a rule-based prediction, not the batch."""
+    agent = AIAgent()
+    matchups = [
+        {"home_team": {"name": f"Home {i}"}, "away_team": {"name": f"Away {i}"}}
+        for i in range(3)
+    ]
+
+    def fake_predict(matchup):
+        if matchup["home_team"]["name"] == "Home 1":
+            raise RuntimeError("boom")
+        return {"winner": matchup["home_team"]["name"]}
+
+    errors = []
+    with patch.object(agent, "generate_prediction", side_effect=fake_predict):
+        predictions = agent.generate_predictions_batch(matchups, errors=errors)
+
+    assert predictions[0]["winner"] == "Home 0"
+    assert predictions[1]["confidence"] == "low"
+    assert predictions[2]["winner"] == "Home 2"
+    assert errors == ["Failed to predict Home 1 vs Away 1: boom"]
+
+
+@pytest.mark.skipif(GENAI_VERSION != "new", reason="requires the google.genai SDK")
+def test_call_gemini_sends_schema_as_system_instruction():
+    """Test the static JSON schema goes in the system instruction, not the prompt."""
+    agent = AIAgent()
+    agent.client = MagicMock()
+    agent.client.models.generate_content.return_value = MagicMock(
+        text='{"winner": "USA"}'
+    )
+    matchup = {"home_team": {"name": "USA"}, "away_team": {"name": "England"}}
+
+    response = agent.call_gemini(matchup)
+
+    kwargs = agent.client.models.generate_content.call_args.kwargs
+    assert kwargs["config"].system_instruction == PREDICTION_SCHEMA_INSTRUCTION
+    assert PREDICTION_SCHEMA_INSTRUCTION not in kwargs["contents"]
+    assert "USA" in kwargs["contents"]
+    assert response.text == '{"winner": "USA"}'
+
+
+def test_build_prompt_includes_optional_sections():
+    """Test FIFA ranking and API-Football sections are filled from templates."""
+    agent = AIAgent()
+    matchup = {
+        "home_team": {
+            "name": "USA",
+            "avg_xg": 1.5,
+            "fifa_ranking": 11,
+            "fifa_points": 1673.5,
+            "fifa_confederation": "CONCACAF",
+        },
+        "away_team": {"name": "England"},
+        "api_football_prediction": {
+            "predictions": {"percent": {"home": "45", "draw": "30", "away": "25"}}
+        },
+    }
+
+    prompt = agent.build_prompt(matchup)
+
+    assert "Hjemmelag: USA\n- Gjennomsnittlig xG: 1.5" in prompt
+    assert "- FIFA-rangering: #11 (1673.50 poeng, CONCACAF)" in prompt
+    assert "Bortelag: England\n- Gjennomsnittlig xG: N/A" in prompt
+    assert "- Siste form: Ukjent" in prompt
+    assert "Hjemme 45%, Uavgjort 30%, Borte 25%" in prompt
+    assert "- Forventet vinner: N/A" in prompt
@@ -59,7 +59,7 @@ class TestAPIFootballSync:
 
         mock_data_aggregator.fetch_teams.return_value = mock_api_response
         mock_firestore.store_raw_api_response.return_value = "teams_1_2026"
-        mock_firestore.get_all_teams.return_value = []  # No existing teams
+        mock_firestore.get_teams_by_api_ids.return_value = []  # No existing teams
 
         # Import will fail - APIFootballSync doesn't exist yet
         from src.api_football_sync import APIFootballSync
@@ -281,7 +281,7 @@ class TestAPIFootballSync:
         ]
 
         mock_data_aggregator.fetch_teams.return_value = mock_api_response
-        mock_firestore.get_all_teams.return_value = existing_teams
+        mock_firestore.get_teams_by_api_ids.return_value = existing_teams
         mock_firestore.store_raw_api_response.return_value = "teams_1_2026"
 
         # Import will fail - APIFootballSync doesn't exist yet
@@ -299,8 +299,10 @@ class TestAPIFootballSync:
 
         # Assert: Verify teams collection updated
         assert result.entities_added == 1  # Liverpool is new
-        assert result.entities_updated == 1  # Manchester United exists
+        assert result.entities_updated == 0  # Manchester United is unchanged
+        assert result.entities_unchanged == 1
         assert result.entity_type == "teams"
+        mock_firestore.set_sync_metadata.assert_called_once()
 
     def test_sync_fixtures_end_to_end(self):
         """
@@ -337,7 +339,7 @@ class TestAPIFootballSync:
         existing_matches = []
 
         mock_data_aggregator.fetch_fixtures.return_value = mock_api_response
-        mock_firestore.get_all_matches.return_value = existing_matches
+        mock_firestore.get_matches_by_fixture_ids.return_value = existing_matches
         mock_firestore.store_raw_api_response.return_value = "fixtures_1_2026"
 
         # Import will fail - APIFootballSync doesn't exist yet
@@ -356,3 +358,103 @@ class TestAPIFootballSync:
         # Assert: Verify matches collection updated
         assert result.entities_added == 1  # New fixture
         assert result.entity_type == "fixtures"
+
+    def test_sync_teams_writes_updates_in_one_bulk_upsert(self):
+        """Test that changed and force-resolved teams share one bulk write."""
+        # Arrange: One renamed team, one unchanged, one overridden by hand
+        mock_firestore = Mock()
+        mock_data_aggregator = Mock()
+
+        mock_data_aggregator.fetch_teams.return_value = {
+            "response": [
+                {"team": {"id": 10, "name": "USA"}},
+                {"team": {"id": 20, "name": "Mexico"}},
+                {"team": {"id": 30, "name": "Canada"}},
+            ]
+        }
+        mock_firestore.get_teams_by_api_ids.return_value = [
+            {"id": 1, "name": "United States", "api_football_id": 10},
+            {"id": 2, "name": "Mexico", "api_football_id": 20},
+            {"id": 3, "name": "Kanada", "api_football_id": 30, "manual_override": True},
+        ]
+        mock_firestore.store_raw_api_response.return_value = "teams_1_2026"
+
+        from src.api_football_sync import APIFootballSync
+
+        sync = APIFootballSync(
+            firestore_manager=mock_firestore, data_aggregator=mock_data_aggregator
+        )
+
+        # Act
+        result = sync.sync_teams(league_id=1, season=2026, force_update=True)
+
+        # Assert: Changed documents written through a single bulk upsert,
+        # unchanged Mexico only covered by the sync metadata write
+        mock_firestore.upsert_teams_bulk.assert_called_once()
+        updates = {u["id"]: u for u in mock_firestore.upsert_teams_bulk.call_args[0][0]}
+        assert set(updates) == {1, 3}
+        assert updates[1]["name"] == "USA"
+        assert updates[3]["name"] == "Canada"
+        assert updates[3]["manual_override"] is False
+        assert all(u["api_football_raw_id"] == "teams_1_2026" for u in updates.values())
+        assert result.entities_updated == 2
+        assert result.entities_unchanged == 1
+        assert result.status == "success"
+        mock_firestore.set_sync_metadata.assert_called_once_with(
+            "teams", 1, 2026, result.synced_at
+        )
+
+    def test_detect_changes_compares_content_hashes(self):
+        """Test that stored content hashes decide whether an entity changed."""
+        from src.api_football_sync import APIFootballSync, content_hash
+
+        sync = APIFootballSync(firestore_manager=Mock(), data_aggregator=Mock())
+
+        same = {"team": {"id": 1, "name": "USA", "logo": "usa.png"}}
+        new_logo = {"team": {"id": 2, "name": "Mexico", "logo": "mex-2026.png"}}
+        existing = [
+            {
+                "id": 1,
+                "name": "USA",
+                "api_football_id": 1,
+                "content_hash": content_hash(same),
+            },
+            {
+                "id": 2,
+                "name": "Mexico",
+                "api_football_id": 2,
+                "content_hash": content_hash({"team": {"id": 2, "name": "Mexico"}}),
+            },
+        ]
+
+        changes = sync.detect_changes([same, new_logo], existing)
+
+        # Unchanged hash is skipped; a change outside the synced field still updates
+        assert changes.entities_unchanged == [same]
+        assert changes.entities_to_update == [new_logo]
+        assert changes.content_hashes[2] == content_hash(new_logo)
+
+    def test_detect_changes_matches_fixtures_by_fixture_id(self):
+        """Test that fixtures are matched on api_football_fixture_id."""
+        from src.api_football_sync import APIFootballSync
+
+        sync = APIFootballSync(firestore_manager=Mock(), data_aggregator=Mock())
+
+        raw_entities = [
+            {"fixture": {"id": 100, "date": "2026-06-11T19:00:00+00:00"}},
+            {"fixture": {"id": 101, "date": "2026-06-12T19:00:00+00:00"}},
+        ]
+        existing_matches = [
+            {
+                "id": 1,
+                "api_football_fixture_id": 100,
+                "kickoff": "2026-06-11T18:00:00+00:00",
+            },
+        ]
+
+        changes = sync.detect_changes(
+            raw_entities, existing_matches, entity_type="fixtures"
+        )
+
+        assert changes.entities_to_update == [raw_entities[0]]
+        assert changes.entities_to_add == [raw_entities[1]]
@@ -1,7 +1,20 @@
 import pytest
 from datetime import datetime
 from unittest.mock import MagicMock
+from src import data_aggregator
 from src.data_aggregator import DataAggregator
+from src.exceptions import APIRateLimitError, DataAggregationError
+from src.rate_limiter import AdaptiveTokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch):
+    """Give each test its own empty-history API-Football rate limiter."""
+    monkeypatch.setattr(
+        data_aggregator,
+        "_api_football_rate_limiter",
+        AdaptiveTokenBucket(rate=2.0, capacity=1, min_rate=0.125),
+    )
 
 
 def test_compute_metrics_basic():
@@ -141,9 +154,11 @@ def test_cache_logic(tmp_path):
     # If we use the date in filename, it's naturally expired when the day changes.
     assert aggregator.get_cached_stats(team_id) is not None  # still hits today's
 
-    # Removing today's to check miss on yesterday's
+    # Removing today's to check miss on yesterday's (fresh instance, so the
+    # in-process cache does not serve today's entry)
     os.remove(cache_file)
-    assert aggregator.get_cached_stats(team_id) is None
+    fresh = DataAggregator(cache_dir=str(cache_dir))
+    assert fresh.get_cached_stats(team_id) is None
 
 
 def test_save_to_cache(tmp_path):
@@ -178,8 +193,33 @@ def test_rate_limiting(monkeypatch):
     aggregator.fetch_team_stats(1)
     aggregator.fetch_team_stats(2)
 
-    # Check if sleep was called with 0.5
-    mock_sleep.assert_any_call(0.5)
+    # Second request waits out the rest of the 0.5s interval
+    waits = [call.args[0] for call in mock_sleep.call_args_list]
+    assert any(0.4 < wait <= 0.5 for wait in waits)
+
+
+def test_rate_limit_shared_across_instances(monkeypatch):
+    """Test separate aggregators draw from the same 0.5s request budget."""
+    import time
+
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(time, "monotonic", MagicMock(return_value=100.0))
+    # Recreate the bucket so it starts on the mocked clock
+    monkeypatch.setattr(
+        data_aggregator,
+        "_api_football_rate_limiter",
+        AdaptiveTokenBucket(rate=2.0, capacity=1, min_rate=0.125),
+    )
+
+    first, second = DataAggregator(), DataAggregator()
+    assert first.rate_limiter is second.rate_limiter
+
+    first._enforce_rate_limit()
+    mock_sleep.assert_not_called()
+
+    second._enforce_rate_limit()
+    mock_sleep.assert_called_once_with(0.5)
 
 
 def test_retry_exponential_backoff(monkeypatch):
@@ -330,13 +370,12 @@ def test_fetch_team_fixtures_empty_response():
 
 def test_fetch_from_api_supports_last_and_next_params():
     """Test that fetch_from_api correctly handles last and next parameters."""
-    import requests
     from unittest.mock import patch
 
     aggregator = DataAggregator()
 
-    # Mock requests.get to capture the params
-    with patch("requests.get") as mock_get:
+    # Mock the pooled session's get to capture the params
+    with patch.object(aggregator._session, "get") as mock_get:
         mock_response = MagicMock()
         mock_response.json.return_value = {"response": []}
         mock_response.raise_for_status = MagicMock()
@@ -350,3 +389,242 @@ def test_fetch_from_api_supports_last_and_next_params():
         assert call_args[1]["params"]["team"] == 772
         assert call_args[1]["params"]["last"] == 5
         assert call_args[1]["params"]["next"] == 3
+
+
+def test_session_reused_with_api_headers():
+    """Test that API calls share one pooled session carrying the API headers."""
+    from unittest.mock import patch
+
+    aggregator = DataAggregator()
+    assert aggregator._session.headers["x-rapidapi-host"] == (
+        "v3.football.api-sports.io"
+    )
+
+    with patch.object(aggregator._session, "get") as mock_get:
+        mock_get.return_value.json.return_value = {"response": []}
+
+        aggregator.fetch_from_api(772, last=5)
+        aggregator.fetch_from_api(773, last=5)
+
+        assert mock_get.call_count == 2
+        assert "headers" not in mock_get.call_args[1]
+
+    aggregator.close()
+
+
+def test_fetch_team_stats_batch(monkeypatch):
+    """Test batch fetch returns stats per team and the error for failed teams."""
+    import time
+
+    monkeypatch.setattr(time, "sleep", MagicMock())
+
+    aggregator = DataAggregator()
+
+    def fake_fetch(team_id, last=5, next=0):
+        if team_id == 3:
+            raise Exception("500 Server Error")
+        return {
+            "response": [
+                {
+                    "fixture": {"id": team_id * 100},
+                    "teams": {"home": {"id": team_id}, "away": {"id": 99}},
+                    "goals": {"home": 1, "away": 0},
+                }
+            ]
+        }
+
+    aggregator.fetch_from_api = MagicMock(side_effect=fake_fetch)
+
+    result = aggregator.fetch_team_stats_batch([1, 2, 3], fetch_xg=False)
+
+    assert set(result) == {1, 2, 3}
+    assert isinstance(result[3], DataAggregationError)
+    assert result[1]["form_string"] == "W"
+    assert result[2]["clean_sheets"] == 1
+
+
+def test_in_process_cache_skips_disk(tmp_path, monkeypatch):
+    """Test repeat lookups are served from memory and saves write through."""
+    import builtins
+
+    aggregator = DataAggregator(cache_dir=str(tmp_path))
+    stats = {"avg_xg": 1.2, "clean_sheets": 1}
+    aggregator.save_to_cache(7, stats)
+
+    mock_open = MagicMock(side_effect=AssertionError("disk read"))
+    monkeypatch.setattr(builtins, "open", mock_open)
+
+    assert aggregator.get_cached_stats(7) == stats
+    mock_open.assert_not_called()
+
+
+def test_cached_stats_are_not_shared_with_callers(tmp_path):
+    """Test mutating saved or returned stats does not change the cache."""
+    aggregator = DataAggregator(cache_dir=str(tmp_path))
+    stats = {"avg_xg": 1.2}
+    aggregator.save_to_cache(7, stats)
+    stats["avg_xg"] = 9.9
+
+    cached = aggregator.get_cached_stats(7)
+    cached["has_real_data"] = True
+
+    assert aggregator.get_cached_stats(7) == {"avg_xg": 1.2}
+
+
+def test_today_is_formatted_once_per_day(monkeypatch):
+    """Test the cache date string is reused until local midnight passes."""
+    from src import data_aggregator as module
+
+    aggregator = DataAggregator()
+    today = aggregator._today()
+    assert today == datetime.now().strftime("%Y-%m-%d")
+
+    mock_datetime = MagicMock(wraps=datetime)
+    monkeypatch.setattr(module, "datetime", mock_datetime)
+    assert aggregator._today() == today
+    mock_datetime.now.assert_not_called()
+
+    aggregator._today_expires_at = 0.0
+    aggregator._today()
+    mock_datetime.now.assert_called_once()
+
+
+def test_rate_limit_detected_by_exception_type(monkeypatch):
+    """Test only APIRateLimitError counts as a rate limit, not a "429" message."""
+    import time
+
+    monkeypatch.setattr(time, "sleep", MagicMock())
+
+    aggregator = DataAggregator()
+    aggregator.fetch_from_api = MagicMock(side_effect=APIRateLimitError("429"))
+    with pytest.raises(APIRateLimitError):
+        aggregator.fetch_team_stats(1, fetch_xg=False)
+    assert aggregator.fetch_from_api.call_count == 4
+
+    aggregator.fetch_from_api = MagicMock(side_effect=Exception("Team 429 FC"))
+    with pytest.raises(DataAggregationError):
+        aggregator.fetch_team_stats(1, fetch_xg=False)
+
+
+def test_warm_preloads_todays_cache_files(tmp_path, monkeypatch):
+    """Test warm() loads today's cache files so later lookups skip the disk."""
+    import builtins
+    import json
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    for key, stats in ((5, {"avg_xg": 1.1}), ("prediction_9", {"winner": "home"})):
+        with open(tmp_path / f"team_stats_{key}_{today}.json", "w") as f:
+            json.dump(stats, f)
+    with open(tmp_path / "team_stats_6_2000-01-01.json", "w") as f:
+        json.dump({"avg_xg": 0.4}, f)
+
+    aggregator = DataAggregator(cache_dir=str(tmp_path))
+    assert aggregator.warm() == 2
+
+    monkeypatch.setattr(builtins, "open", MagicMock(side_effect=AssertionError))
+    assert aggregator.get_cached_stats(5) == {"avg_xg": 1.1}
+    assert aggregator.get_cached_stats("prediction_9") == {"winner": "home"}
+
+
+def test_save_to_cache_is_atomic(tmp_path, monkeypatch):
+    """Test a failed write leaves the previous cache file intact and no temp file."""
+    import json
+
+    aggregator = DataAggregator(cache_dir=str(tmp_path))
+    aggregator.save_to_cache(1, {"avg_xg": 1.5})
+
+    monkeypatch.setattr(json, "dump", MagicMock(side_effect=OSError("disk full")))
+    aggregator.save_to_cache(1, {"avg_xg": 2.0})
+
+    fresh = DataAggregator(cache_dir=str(tmp_path))
+    assert fresh.get_cached_stats(1) == {"avg_xg": 1.5}
+    assert [p.suffix for p in tmp_path.iterdir()] == [".json"]
+
+
+def test_transform_fetches_xg_for_every_finished_fixture():
+    """Test xG statistics are fetched per finished fixture and merged in order."""
+    aggregator = DataAggregator()
+    aggregator.fetch_fixture_statistics = MagicMock(
+        side_effect=lambda fixture_id: [
+            {
+                "team": {"id": 1},
+                "statistics": [{"type": "expected_goals", "value": f"{fixture_id}.5"}],
+            }
+        ]
+    )
+    api_response = {
+        "response": [
+            {
+                "fixture": {"id": fixture_id},
+                "teams": {"home": {"id": 1}, "away": {"id": 2}},
+                "goals": {"home": goals, "away": goals},
+            }
+            for fixture_id, goals in ((1, 0), (2, None), (3, 1))
+        ]
+    }
+
+    fixtures = aggregator.transform_api_response(api_response, 1, fetch_xg=True)
+
+    assert [f["xg"] for f in fixtures] == [1.5, 3.5]
+    assert aggregator.fetch_fixture_statistics.call_count == 2
+
+
+def test_rate_limit_retry_honours_retry_after(monkeypatch):
+    """Test a 429 with Retry-After waits that long and slows the shared limiter."""
+    import time
+    import requests
+
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+
+    aggregator = DataAggregator()
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "3"})
+    throttled.raise_for_status.side_effect = requests.HTTPError(response=throttled)
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"response": []}
+    aggregator._session.get = MagicMock(side_effect=[throttled, ok])
+
+    result = aggregator.fetch_team_stats(1, fetch_xg=False)
+
+    assert result["form_string"] == ""
+    mock_sleep.assert_any_call(3.0)
+    assert aggregator.rate_limiter.rate == 1.0  # Halved from 2 requests/s
+
+
+def test_rate_limit_retry_after_beyond_budget_fails_fast(monkeypatch):
+    """Test a Retry-After longer than the total retry budget is not waited out."""
+    import time
+    import requests
+
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+
+    aggregator = DataAggregator()
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "60"})
+    throttled.raise_for_status.side_effect = requests.HTTPError(response=throttled)
+    aggregator._session.get = MagicMock(return_value=throttled)
+
+    with pytest.raises(APIRateLimitError) as exc_info:
+        aggregator.fetch_team_stats(1, fetch_xg=False)
+
+    assert exc_info.value.retry_after == 60.0
+    assert aggregator._session.get.call_count == 1
+    assert 60.0 not in [call.args[0] for call in mock_sleep.call_args_list]
+
+
+def test_save_to_cache_creates_directory_once(tmp_path, monkeypatch):
+    """Test the cache directory is created on first save, and again if removed."""
+    import shutil
+    from pathlib import Path
+
+    aggregator = DataAggregator(cache_dir=str(tmp_path / "cache"))
+    mkdir = MagicMock(wraps=Path.mkdir)
+    monkeypatch.setattr(Path, "mkdir", lambda self, **kw: mkdir(self, **kw))
+
+    aggregator.save_to_cache(1, {"avg_xg": 1.0})
+    aggregator.save_to_cache(2, {"avg_xg": 2.0})
+    assert mkdir.call_count == 1
+
+    shutil.rmtree(tmp_path / "cache")
+    aggregator.save_to_cache(3, {"avg_xg": 3.0})
+    assert (tmp_path / "cache" / f"team_stats_3_{aggregator._today()}.json").exists()
@@ -5,6 +5,9 @@ This module tests the new methods for storing and retrieving raw API-Football
 responses in Firestore.
 """
 
+import json
+import zlib
+
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime, timedelta
@@ -67,7 +70,9 @@ class TestFirestoreManagerRawAPIMethods:
             assert call_args["entity_type"] == "teams"
             assert call_args["league_id"] == 1
             assert call_args["season"] == 2026
-            assert call_args["raw_response"] == raw_response
+            assert call_args["content_encoding"] == "zlib+json"
+            stored = json.loads(zlib.decompress(call_args["raw_response"]))
+            assert stored == raw_response
             assert "fetched_at" in call_args
             assert isinstance(call_args["fetched_at"], datetime)
 
@@ -129,6 +134,28 @@ class TestFirestoreManagerRawAPIMethods:
             assert result["season"] == 2026
             assert "raw_response" in result
 
+    def test_get_raw_api_response_decodes_compressed_payload(self):
+        """Test that zlib-compressed raw responses are decoded on read."""
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            raw_response = {"response": [{"team": {"id": 1, "name": "USA"}}]}
+            mock_snap = mock_db.collection.return_value.document.return_value.get()
+            mock_snap.exists = True
+            mock_snap.to_dict.return_value = {
+                "entity_type": "teams",
+                "raw_response": zlib.compress(json.dumps(raw_response).encode()),
+                "content_encoding": "zlib+json",
+            }
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            result = manager.get_raw_api_response("teams_1_2026")
+
+            assert result["raw_response"] == raw_response
+
     # T012: FIFA Rankings Firestore Methods Tests
 
     def test_get_fifa_rankings_success(self):
@@ -289,3 +316,325 @@ class TestFirestoreManagerRawAPIMethods:
             delta = expires_at - fetched_at
             assert delta.days == 30
             assert delta.seconds == 0  # Should be exactly 30 days, no extra hours/minutes
+
+
+class TestFirestoreManagerBulkWrites:
+    """Test suite for FirestoreManager batched write helpers."""
+
+    def test_upsert_teams_bulk_commits_in_batches_of_500(self):
+        """
+        Test that upsert_teams_bulk groups writes into WriteBatch commits.
+
+        Verifies:
+        - One merge batch.set per team (no per-document set calls)
+        - A commit every MAX_BATCH_SIZE operations plus one for the remainder
+        """
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_collection = MagicMock()
+            mock_db.collection.return_value = mock_collection
+            mock_batch = MagicMock()
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            teams = [{"id": i, "name": f"Team {i}"} for i in range(1, 1202)]
+
+            # Act: Upsert teams in bulk
+            written = manager.upsert_teams_bulk(teams)
+
+            # Assert: All teams written through the batch
+            assert written == 1201
+            assert mock_batch.set.call_count == 1201
+            mock_collection.document.return_value.set.assert_not_called()
+
+            # Assert: 500 + 500 + 201 -> three commits
+            assert mock_batch.commit.call_count == 3
+
+            # Assert: Partial document merged as given
+            call = mock_batch.set.call_args_list[0]
+            assert call[0][1] == {"id": 1, "name": "Team 1"}
+            assert call[1]["merge"] is True
+
+    def test_upsert_matches_bulk_empty_list_skips_commit(self):
+        """Test that upsert_matches_bulk does not commit an empty batch."""
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_batch = MagicMock()
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act: Upsert no matches
+            written = manager.upsert_matches_bulk([])
+
+            # Assert: Nothing committed
+            assert written == 0
+            mock_batch.commit.assert_not_called()
+
+    def test_upsert_teams_bulk_accepts_generator(self):
+        """Test that bulk writes stream from a generator without materializing it."""
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_batch = MagicMock()
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            teams = ({"id": i, "name": f"Team {i}"} for i in range(1, 601))
+
+            # Act: Upsert teams from a generator
+            written = manager.upsert_teams_bulk(teams)
+
+            # Assert: 500 + 100 -> two commits
+            assert written == 600
+            assert mock_batch.commit.call_count == 2
+
+    def test_update_team_stats_bulk_merges_stats(self):
+        """Test that update_team_stats_bulk merges stats with shared TTL metadata."""
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_batch = MagicMock()
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            team_stats = [
+                (1, {"avg_xg": 1.5, "form_string": "W-W-D"}),
+                (2, {"avg_xg": 0.9, "form_string": "L-D-L"}),
+            ]
+
+            # Act: Update stats in bulk
+            written = manager.update_team_stats_bulk(team_stats, ttl_hours=24)
+
+            # Assert: Single commit with merge writes
+            assert written == 2
+            mock_batch.commit.assert_called_once()
+            first_call = mock_batch.set.call_args_list[0]
+            assert first_call[1]["merge"] is True
+
+            stats = first_call[0][1]["stats"]
+            assert stats["avg_xg"] == 1.5
+            assert stats["expires_at"] - stats["fetched_at"] == timedelta(hours=24)
+
+    def test_bulk_commit_retries_transient_errors(self):
+        """Test that transient commit failures are retried with backoff."""
+        from google.api_core import exceptions as google_exceptions
+
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client, patch(
+            "src.firestore_manager.time.sleep"
+        ) as mock_sleep:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_batch = MagicMock()
+            mock_batch.commit.side_effect = [
+                google_exceptions.Aborted("contention"),
+                google_exceptions.ServiceUnavailable("unavailable"),
+                [],
+            ]
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act: Upsert one team
+            written = manager.upsert_teams_bulk([{"id": 1, "name": "Team 1"}])
+
+            # Assert: Third attempt succeeds after two backoff sleeps
+            assert written == 1
+            assert mock_batch.commit.call_count == 3
+            assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1]
+
+    def test_bulk_commit_raises_non_transient_errors(self):
+        """Test that non-transient commit failures are raised without retrying."""
+        from google.api_core import exceptions as google_exceptions
+
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client, patch(
+            "src.firestore_manager.time.sleep"
+        ) as mock_sleep:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_batch = MagicMock()
+            mock_batch.commit.side_effect = google_exceptions.PermissionDenied("no")
+            mock_db.batch.return_value = mock_batch
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act & Assert: Error surfaces after a single attempt
+            with pytest.raises(google_exceptions.PermissionDenied):
+                manager.upsert_teams_bulk([{"id": 1, "name": "Team 1"}])
+
+            assert mock_batch.commit.call_count == 1
+            mock_sleep.assert_not_called()
+
+
+class TestFirestoreManagerQueries:
+    """Test suite for FirestoreManager server-side filtered queries."""
+
+    def test_query_teams_filters_server_side(self):
+        """
+        Test that query_teams pushes the API-ID filter into the Firestore query.
+
+        Verifies:
+        - The API-ID filter is issued as a where() clause
+        - Placeholders are dropped, but teams missing is_placeholder are kept
+        - Results come back sorted by team ID
+        """
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_collection = MagicMock()
+            mock_db.collection.return_value = mock_collection
+
+            mock_query = MagicMock()
+            mock_collection.where.return_value = mock_query
+
+            doc_b = MagicMock()
+            doc_b.to_dict.return_value = {
+                "id": 2,
+                "api_football_id": 25,
+                "is_placeholder": False,
+            }
+            doc_a = MagicMock()
+            doc_a.to_dict.return_value = {"id": 1, "api_football_id": 16}
+            doc_placeholder = MagicMock()
+            doc_placeholder.to_dict.return_value = {
+                "id": 3,
+                "api_football_id": 99,
+                "is_placeholder": True,
+            }
+            mock_query.stream.return_value = [doc_b, doc_placeholder, doc_a]
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act: Query teams with API-Football IDs
+            teams = manager.query_teams(with_api_id=True)
+
+            # Assert: API-ID filter applied in Firestore, placeholders in Python
+            mock_collection.where.assert_called_once_with("api_football_id", "!=", None)
+            mock_collection.stream.assert_not_called()
+            assert [t["id"] for t in teams] == [1, 2]
+
+    def test_count_teams_uses_aggregation_query(self):
+        """
+        Test that count_teams runs a count() aggregation instead of streaming.
+
+        Verifies:
+        - Filters are applied before counting
+        - The aggregation result value is returned
+        - No documents are downloaded
+        """
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_collection = MagicMock()
+            mock_db.collection.return_value = mock_collection
+
+            mock_query = MagicMock()
+            mock_collection.where.return_value = mock_query
+            aggregation_result = MagicMock()
+            aggregation_result.value = 42
+            mock_query.count.return_value.get.return_value = [[aggregation_result]]
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act: Count teams with API-Football IDs
+            count = manager.count_teams(with_field="api_football_id")
+
+            # Assert: Aggregation used, nothing streamed
+            assert count == 42
+            mock_collection.where.assert_called_once_with("api_football_id", "!=", None)
+            mock_collection.stream.assert_not_called()
+            mock_query.stream.assert_not_called()
+
+    def test_get_teams_by_api_ids_chunks_in_queries(self):
+        """Test that lookups by API ID use "in" queries of at most 30 values."""
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client") as mock_client:
+            mock_db = MagicMock()
+            mock_client.return_value = mock_db
+            mock_collection = MagicMock()
+            mock_db.collection.return_value = mock_collection
+
+            doc = MagicMock()
+            doc.to_dict.return_value = {"id": 1, "api_football_id": 16}
+            mock_collection.where.return_value.stream.return_value = [doc]
+
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+
+            # Act: Look up 35 distinct IDs (plus a duplicate)
+            teams = manager.get_teams_by_api_ids([*range(35), 0])
+
+            # Assert: Two targeted queries, no collection scan
+            chunks = [c.args[2] for c in mock_collection.where.call_args_list]
+            assert sorted(len(chunk) for chunk in chunks) == [5, 30]
+            assert all(
+                c.args[:2] == ("api_football_id", "in")
+                for c in mock_collection.where.call_args_list
+            )
+            mock_collection.stream.assert_not_called()
+            assert len(teams) == 2
+
+
+class TestFirestoreManagerPredictionCache:
+    """Test suite for persisted prediction invalidation."""
+
+    def test_should_regenerate_when_prompt_version_changes(self):
+        """
+        Test that a prediction from another model/prompt template is stale.
+
+        Verifies:
+        - Same stats hash and prompt version reuses the prediction
+        - A different prompt version forces regeneration
+        - Callers not passing a prompt version keep the stats-only check
+        """
+        # Arrange: Create mock Firestore client
+        with patch("src.firestore_manager.firestore.Client"):
+            from src.firestore_manager import FirestoreManager
+
+            manager = FirestoreManager()
+            manager.get_match_prediction = MagicMock(
+                return_value={
+                    "winner": "USA",
+                    "team_stats_hash": "abc",
+                    "prompt_version": "gemini-2.5-flash:v1",
+                }
+            )
+
+            # Act & Assert
+            assert not manager.should_regenerate_prediction(
+                1, "abc", prompt_version="gemini-2.5-flash:v1"
+            )
+            assert manager.should_regenerate_prediction(
+                1, "abc", prompt_version="gemini-2.5-flash:v2"
+            )
+            assert not manager.should_regenerate_prediction(1, "abc")
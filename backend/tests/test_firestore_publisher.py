@@ -417,3 +417,14 @@ def test_diff_check_whitespace_differences():
 
     # Should save because strings are different
     assert should_save is True
+
+
+def test_publisher_reuses_injected_client():
+    """Test that an injected Firestore client is reused instead of creating one."""
+    mock_db = MagicMock()
+
+    with patch("src.firestore_publisher.firestore.Client") as mock_client:
+        publisher = FirestorePublisher(db=mock_db)
+
+    mock_client.assert_not_called()
+    assert publisher.db is mock_db
@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from populate_from_api_football import (
+    API_FOOTBALL_TEAM_IDS,
+    UNMAPPED_FIFA_CODES,
+    fetch_team_statistics,
+)
+
+
+def test_api_football_team_ids_are_unique():
+    """Each API-Football ID must map to exactly one FIFA code."""
+    ids = list(API_FOOTBALL_TEAM_IDS.values())
+    assert len(ids) == len(set(ids))
+
+
+def test_unverified_codes_are_not_in_mapping():
+    """Teams awaiting a verified ID must not fall back to another team's ID."""
+    assert not UNMAPPED_FIFA_CODES & set(API_FOOTBALL_TEAM_IDS)
+
+
+def test_api_football_team_ids_are_read_only():
+    """The mapping cannot be mutated at runtime."""
+    with pytest.raises(TypeError):
+        API_FOOTBALL_TEAM_IDS["XXX"] = 1
+
+
+def test_fetch_team_statistics_counts_failed_write_for_whole_batch():
+    """A failed Firestore write marks every team in the batch as failed."""
+    teams = [
+        {"id": i, "name": f"Team {i}", "api_football_id": 100 + i} for i in range(3)
+    ]
+    firestore_db = MagicMock()
+    firestore_db.update_team_stats_bulk.side_effect = RuntimeError("unavailable")
+    aggregator = MagicMock()
+    aggregator.get_cached_stats.return_value = {"avg_xg": 1.2}
+
+    success_count = fetch_team_statistics(firestore_db, aggregator, teams=teams)
+
+    assert success_count == 0
+    firestore_db.update_team_stats_bulk.assert_called_once()
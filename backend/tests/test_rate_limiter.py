@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from src.rate_limiter import AdaptiveTokenBucket, TokenBucket
+
+
+def test_burst_up_to_capacity_without_waiting():
+    """Test a full bucket serves `capacity` requests immediately."""
+    with patch("src.rate_limiter.time.monotonic", return_value=100.0), patch(
+        "src.rate_limiter.time.sleep"
+    ) as mock_sleep:
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        waits = [bucket.acquire() for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.0]
+    mock_sleep.assert_not_called()
+
+
+def test_paces_requests_once_bucket_is_empty():
+    """Test requests beyond the burst wait for the refill rate."""
+    with patch("src.rate_limiter.time.monotonic", return_value=100.0), patch(
+        "src.rate_limiter.time.sleep"
+    ) as mock_sleep:
+        bucket = TokenBucket(rate=2.0, capacity=1)
+        bucket.acquire()
+        first_wait = bucket.acquire()
+        second_wait = bucket.acquire()
+
+    # Each queued request reserves the next token: 0.5s, then 1.0s at 2 tokens/s
+    assert first_wait == 0.5
+    assert second_wait == 1.0
+    assert mock_sleep.call_count == 2
+
+
+def test_refills_over_time():
+    """Test tokens refill with elapsed time, capped at capacity."""
+    with patch("src.rate_limiter.time.monotonic") as mock_monotonic, patch(
+        "src.rate_limiter.time.sleep"
+    ) as mock_sleep:
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_monotonic.return_value = 200.0
+        waits = [bucket.acquire() for _ in range(2)]
+
+    assert waits == [0.0, 0.0]
+    mock_sleep.assert_not_called()
+
+
+def test_adaptive_bucket_backs_off_and_recovers():
+    """Test 429s halve the rate (down to min_rate) and successes restore it."""
+    bucket = AdaptiveTokenBucket(
+        rate=2.0, capacity=1, min_rate=0.5, recovery_successes=2, recovery_factor=0.5
+    )
+
+    bucket.on_throttled()
+    bucket.on_throttled()
+    bucket.on_throttled()
+    assert bucket.rate == 0.5
+
+    bucket.on_success()
+    assert bucket.rate == 0.5
+    bucket.on_success()
+    assert bucket.rate == 1.0
+
+    for _ in range(4):
+        bucket.on_success()
+    assert bucket.rate == 2.0